@@ -4,6 +4,7 @@ Starts device readers, mapping, and vJoy output loop using a chosen profile.
 """
 import argparse
 import logging
+import queue
 import signal
 import threading
 import time
@@ -76,37 +77,79 @@ def main():
     ch_throttle = CHThrottleReader()
 
     stop_event = threading.Event()
-    state_lock = threading.Lock()
-    accumulated_state = {}  # Store merged state from all devices
+    updates = queue.SimpleQueue()  # states emitted by the readers, drained by map_loop
+    accumulated_state = {}  # Store merged state from all devices (map_loop thread only)
 
     def on_state(state):
-        with state_lock:
-            # Merge this device's state into accumulated state
-            device_name = state.get("device")
-            accumulated_state[device_name] = state
-            
-            # Map the full accumulated state
-            cmd = mapper.map_state_to_vjoy_full(accumulated_state)
-            vjoy.apply(cmd)
+        # Runs on the reader threads: hand the state off and return immediately
+        updates.put(state)
+
+    def drain_updates():
+        # Readers emit one live dict per device, so this just keeps references
+        while True:
+            try:
+                state = updates.get_nowait()
+            except queue.Empty:
+                return
+            accumulated_state[state.get("device")] = state
+
+    def map_loop():
+        """Single consumer: fold queued states into the accumulated state and map once per batch.
+
+        Passes are capped at --hz per second; input arriving faster than vJoy
+        consumes commands is coalesced into the next pass.
+        """
+        tick = 1.0 / float(args.hz)
+        next_pass = time.monotonic()
+        while not stop_event.is_set():
+            # Readers only emit on change, so wake on the tick while pulses are
+            # armed; otherwise a toggle pulse would stay high until the next input.
+            pulses_pending = mapper.has_pending_pulses()
+            timeout = max(next_pass - time.monotonic(), 0.0) if pulses_pending else 0.5
+            try:
+                state = updates.get(timeout=timeout)
+            except queue.Empty:
+                if not pulses_pending:
+                    continue
+            else:
+                accumulated_state[state.get("device")] = state
+                delay = next_pass - time.monotonic()
+                if delay > 0:
+                    stop_event.wait(delay)
+                drain_updates()
+            # Advance on a fixed grid so time spent mapping doesn't stretch the
+            # period; after an overshoot (or idling) restart from now instead of bursting.
+            now = time.monotonic()
+            next_pass += tick
+            if next_pass < now:
+                next_pass = now + tick
+            try:
+                vjoy.apply(mapper.map_state_to_vjoy_full(accumulated_state))
+            except Exception:
+                LOG.exception("mapping failed")
 
     x55.subscribe(on_state)
     panel.subscribe(on_state)
     ch_throttle.subscribe(on_state)
+    map_thread = threading.Thread(target=map_loop, name="Mapper", daemon=True)
 
     try:
         vjoy.start()
+        map_thread.start()
         x55.start()
         panel.start()
         ch_throttle.start()
         LOG.info("flightbridge running — press Ctrl+C to stop")
         while not stop_event.is_set():
-            time.sleep(0.5)
+            stop_event.wait(0.5)
     except KeyboardInterrupt:
         LOG.info("shutdown requested")
     finally:
         x55.stop()
         panel.stop()
         ch_throttle.stop()
+        stop_event.set()
+        map_thread.join(timeout=1.0)
         vjoy.stop()
         if led_controller:
             led_controller.disconnect()
@@ -1,17 +1,21 @@
-"""State models and lightweight DTOs"""
+"""State models and lightweight DTOs
+
+Both are slotted dataclasses (Python 3.10+): a VJoyCommand is built on every
+mapping pass, so no per-instance __dict__ is allocated.
+"""
 from dataclasses import dataclass, field
 from typing import Dict, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceState:
     device: str
     axes: Dict[int, float] = field(default_factory=dict)
-    buttons: Dict[int, bool] = field(default_factory=dict)
+    buttons: Dict[int, int] = field(default_factory=dict)  # 1 pressed, 0 released
     hats: Dict[int, Tuple[int, int]] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class VJoyCommand:
     axes: Dict[str, float] = field(default_factory=dict)  # axis name -> -1..1
     buttons: Dict[int, bool] = field(default_factory=dict)  # button id -> state
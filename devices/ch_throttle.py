@@ -1,7 +1,7 @@
 """CH Throttle reader using DirectInput via pygame.joystick
 
-This module provides a `CHThrottleReader` that polls axes/buttons and emits
-normalized DeviceState dictionaries to subscribers.
+This module provides a `CHThrottleReader` that tracks axes/buttons from SDL
+joystick events and emits normalized DeviceState dictionaries to subscribers.
 
 Supports Arduino Leonardo-based CH throttle controller with 1 throttle axis and 12 buttons.
 VID: 2341 (Arduino)
@@ -9,7 +9,6 @@ PID: 8036
 MI: 02 (Multiple Interface 02)
 """
 import threading
-import time
 import logging
 
 try:
@@ -17,8 +16,13 @@ try:
 except Exception:
     pygame = None
 
+from devices.joystick_events import init_joystick_subsystem, shared_pump
+
 LOG = logging.getLogger("flightbridge.ch_throttle")
 
+# The Leonardo firmware exposes more buttons than the throttle has wired
+NUM_BUTTONS = 12
+
 
 class CHThrottleReader:
     """Reads CH Throttle via pygame.joystick (DirectInput).
@@ -27,23 +31,32 @@ class CHThrottleReader:
       {
         'device': 'ch_throttle',
         'axes': {0: float},  # throttle axis normalized to 0.0-1.0
-        'buttons': {0: bool, 1: bool, ..., 11: bool},
+        'buttons': {0: int, 1: int, ..., 11: int},  # 1 pressed, 0 released
         'hats': {}
       }
+
+    A state is emitted once on connect and then only when SDL reports a change.
+    The same dict is emitted every time and updated in place, so subscribers that
+    keep a reference see the live state; they must not mutate it.
     """
 
     def __init__(self):
-        self._subs = []
+        self._subs = ()  # copy-on-write: subscribe() swaps in a new tuple, emits just read it
+        # Cached so emits skip the logger level walk; refreshed in start()
+        self._debug = LOG.isEnabledFor(logging.DEBUG)
         self._t = None
         self._stop = threading.Event()
         self._joystick = None
+        # Single state dict emitted on every change and updated in place
+        self._axes = {0: 0.0}
+        self._buttons = {i: 0 for i in range(NUM_BUTTONS)}  # fixed shape for the 12 wired buttons
+        self._state = {"device": "ch_throttle", "axes": self._axes, "buttons": self._buttons, "hats": {}}
 
     def _find_ch_throttle(self):
         if pygame is None:
             LOG.warning("pygame not available — CHThrottleReader disabled")
             return None
-        pygame.init()
-        pygame.joystick.init()
+        init_joystick_subsystem()
         for i in range(pygame.joystick.get_count()):
             js = pygame.joystick.Joystick(i)
             js.init()
@@ -56,56 +69,96 @@ class CHThrottleReader:
         return None
 
     def subscribe(self, callback):
-        self._subs.append(callback)
+        self._subs = self._subs + (callback,)
 
     def start(self):
         self._stop.clear()
-        self._joystick = self._find_ch_throttle()
+        self._debug = LOG.isEnabledFor(logging.DEBUG)
+        try:
+            js = self._find_ch_throttle()
+            if js:
+                self._attach(js)
+        except Exception:
+            # Leave it to the reconnect scan in _loop rather than failing app startup
+            LOG.exception("error connecting to CH Throttle; will retry")
         self._t = threading.Thread(target=self._loop, name="CHThrottleReader", daemon=True)
         self._t.start()
 
     def stop(self):
         self._stop.set()
+        self._detach()
         if self._t:
             self._t.join(timeout=1.0)
 
-    def _emit(self, state):
-        LOG.debug("ch_throttle raw state -> %s", state)
-        for cb in self._subs:
-            try:
+    def _attach(self, js):
+        """Snapshot the throttle once, then follow it through the event pump."""
+        # pygame gives -1.0 at full throttle, 1.0 at zero throttle (typical for throttle axes)
+        # We want: throttle down (pygame 1.0) = -1.0 (vJoy 0%), throttle up (pygame -1.0) = 1.0 (vJoy 100%)
+        self._axes[0] = -js.get_axis(0)
+        n_buttons = js.get_numbuttons()
+        if n_buttons < NUM_BUTTONS:
+            LOG.warning("CH Throttle exposes %d buttons, expected %d; the rest read as released", n_buttons, NUM_BUTTONS)
+        get_button = js.get_button
+        buttons = self._buttons
+        for i in range(NUM_BUTTONS):
+            buttons[i] = get_button(i) if i < n_buttons else 0
+        self._joystick = js
+        shared_pump().register(js.get_instance_id(), self._on_events)
+        self._emit_state()
+
+    def _detach(self):
+        js = self._joystick
+        self._joystick = None
+        if js is not None:
+            shared_pump().unregister(js.get_instance_id())
+
+    def _emit_state(self):
+        state = self._state
+        if self._debug:
+            LOG.debug("ch_throttle raw state -> %s", state)
+        try:
+            for cb in self._subs:
                 cb(state)
-            except Exception:
-                LOG.exception("subscriber callback failed")
+        except Exception:
+            LOG.exception("subscriber callback failed")
+
+    def _on_events(self, events):
+        """Apply one batch of SDL events for our joystick (pump thread), then emit once.
+
+        Nothing is emitted when none of the events actually changes a value.
+        """
+        axes, buttons = self._axes, self._buttons
+        changed = False
+        for ev in events:
+            t = ev.type
+            if t == pygame.JOYAXISMOTION:
+                if ev.axis != 0:
+                    continue
+                target, key, value = axes, 0, -ev.value  # Invert so throttle up = 1.0
+            elif t == pygame.JOYBUTTONDOWN or t == pygame.JOYBUTTONUP:
+                if ev.button >= NUM_BUTTONS:
+                    continue
+                target, key, value = buttons, ev.button, int(t == pygame.JOYBUTTONDOWN)
+            elif t == pygame.JOYDEVICEREMOVED:
+                LOG.warning("CH Throttle disconnected; will attempt reconnect")
+                self._detach()
+                return
+            else:
+                continue
+            if target.get(key) != value:
+                target[key] = value
+                changed = True
+        if changed:
+            self._emit_state()
 
     def _loop(self):
-        if self._joystick is None:
-            # try reconnect logic
-            while not self._stop.is_set():
-                self._joystick = self._find_ch_throttle()
-                if self._joystick:
-                    break
-                time.sleep(1.0)
+        # Input arrives through the shared event pump; this thread only (re)connects.
         while not self._stop.is_set():
-            try:
-                pygame.event.pump()
-                js = self._joystick
-                if js is None:
-                    time.sleep(0.5)
-                    continue
-                # Read throttle axis (axis 0), remap from -1.0..1.0 to -1.0..1.0 (for vJoy compatibility)
-                # pygame gives -1.0 at full throttle, 1.0 at zero throttle (typical for throttle axes)
-                # We want: throttle down (pygame 1.0) = -1.0 (vJoy 0%), throttle up (pygame -1.0) = 1.0 (vJoy 100%)
-                raw_throttle = js.get_axis(0)
-                throttle = -raw_throttle  # Invert so throttle up = 1.0
-                axes = {0: throttle}
-                
-                # Read buttons 0-11
-                buttons = {i: bool(js.get_button(i)) for i in range(min(12, js.get_numbuttons()))}
-                
-                state = {"device": "ch_throttle", "axes": axes, "buttons": buttons, "hats": {}}
-                self._emit(state)
-                time.sleep(1.0 / 120.0)
-            except Exception:
-                LOG.exception("error reading CH Throttle; will attempt reconnect")
-                self._joystick = None
-                time.sleep(1.0)
+            if self._joystick is None:
+                try:
+                    js = self._find_ch_throttle()
+                    if js:
+                        self._attach(js)
+                except Exception:
+                    LOG.exception("error connecting to CH Throttle; will retry")
+            self._stop.wait(1.0)
@@ -12,6 +12,50 @@ LOG = logging.getLogger("flightbridge.panel")
 LOGITECH_VID = 0x06a3
 FLIGHT_PANEL_PID = 0x0d67
 
+# Reports carry more bits than the panel has switches; only the low ones are mapped
+NUM_SWITCHES = 20
+SWITCH_MASK = (1 << NUM_SWITCHES) - 1
+
+# _SWITCH_LUT[byte_pos][value] -> switch indices whose bit is set in that byte.
+# A byte with no changed bits costs one lookup and no inner loop.
+_SWITCH_LUT = tuple(
+    tuple(
+        tuple(pos * 8 + bit for bit in range(8) if (value >> bit) & 1 and pos * 8 + bit < NUM_SWITCHES)
+        for value in range(256)
+    )
+    for pos in range((NUM_SWITCHES + 7) // 8)
+)
+
+# hidapi's read() blocks in C with the GIL released, so a long timeout costs
+# nothing; it only bounds how long stop() waits for the reader thread.
+READ_TIMEOUT_MS = 500
+
+# HID report descriptor item prefix for a (1-byte) Report ID global item
+_REPORT_ID_ITEM = 0x84
+
+
+def _uses_report_ids(device):
+    """Return True if the device's report descriptor declares numbered reports.
+
+    Input reports from numbered devices start with the report ID byte; for
+    unnumbered ones hidapi strips the implicit ID 0. Returns False when the
+    descriptor cannot be read (older hidapi), matching the panel's known layout.
+    """
+    try:
+        desc = device.get_report_descriptor()
+    except Exception:
+        return False
+    i = 0
+    while i < len(desc):
+        prefix = desc[i]
+        if prefix == 0xFE:  # long item: prefix, data size, tag, data
+            i += 3 + (desc[i + 1] if i + 1 < len(desc) else 0)
+            continue
+        if prefix & 0xFC == _REPORT_ID_ITEM:
+            return True
+        i += 1 + (0, 1, 2, 4)[prefix & 0x03]
+    return False
+
 # Attempt to import hid library for real hardware support
 try:
     import hid
@@ -23,23 +67,32 @@ except ImportError:
 
 class FlightPanelReader:
     def __init__(self):
-        self._subs = []
+        self._subs = ()  # copy-on-write: subscribe() swaps in a new tuple, emits just read it
+        # Cached so emits skip the logger level walk; refreshed in start()
+        self._debug = LOG.isEnabledFor(logging.DEBUG)
         self._t = None
         self._stop = threading.Event()
         self._device = None
         self._endpoint = None
-        self._last_state = None
+        self._prev_bits = None  # last parsed switch bits, None until the first report
+        self._payload_start = 0  # report ID bytes before the switch bits on input reports
+        self._buttons = {idx: 0 for idx in range(NUM_SWITCHES)}
+        # Single state dict emitted on every change and updated in place;
+        # subscribers that keep a reference see the live state and must not mutate it
+        self._state = {"device": "flightpanel", "buttons": self._buttons, "axes": {}, "hats": {}}
 
     def subscribe(self, cb):
-        self._subs.append(cb)
+        self._subs = self._subs + (cb,)
 
     def start(self):
         self._stop.clear()
+        self._debug = LOG.isEnabledFor(logging.DEBUG)
         if HAS_HID:
             try:
                 self._device = hid.device()
                 self._device.open(LOGITECH_VID, FLIGHT_PANEL_PID)
                 LOG.info("Flight Panel found, interface claimed")
+                self._payload_start = 1 if _uses_report_ids(self._device) else 0
                 # Try to seed state immediately so mappings have initial switch positions
                 self._seed_initial_state()
             except Exception as e:
@@ -62,7 +115,8 @@ class FlightPanelReader:
     def stop(self):
         self._stop.set()
         if self._t:
-            self._t.join(timeout=0.5)
+            # Let an in-flight blocking read return before closing the handle
+            self._t.join(timeout=READ_TIMEOUT_MS / 1000.0 + 0.5)
         if self._device:
             try:
                 self._device.close()
@@ -73,22 +127,22 @@ class FlightPanelReader:
         while not self._stop.is_set():
             if self._device:
                 try:
-                    # Read up to 64 bytes with 100ms timeout
-                    data = self._device.read(64, timeout_ms=100)
+                    # Park in hidapi until a report arrives (or the timeout lapses)
+                    data = self._device.read(64, timeout_ms=READ_TIMEOUT_MS)
                     if data:
                         self._parse_and_emit(data)
                 except Exception as e:
                     LOG.exception("Error reading from Flight Panel: %s", e)
                     self._device = None
             else:
-                # Stub mode: sleep to avoid busy loop
-                self._stop.wait(0.1)
+                # Stub mode (or device lost): nothing to read, park until shutdown
+                self._stop.wait()
 
     def _seed_initial_state(self):
         """Query current switch positions using feature report.
 
         Feature reports allow us to query device state on demand without waiting for
-        a change event. Falls back to emitting an all-False state so downstream logic
+        a change event. Falls back to emitting an all-released state so downstream logic
         has a baseline and multi-input bindings can evaluate before the first change.
         """
         if not self._device:
@@ -98,8 +152,10 @@ class FlightPanelReader:
         try:
             data = self._device.get_feature_report(0, 64)
             if data:
-                LOG.debug("FlightPanel: queried initial state via feature report: %s", ' '.join(f"{b:02x}" for b in data))
-                self._parse_and_emit(data)
+                if self._debug:
+                    LOG.debug("FlightPanel: queried initial state via feature report: %s", bytes(data).hex(' '))
+                # Feature reports always lead with the report ID byte
+                self._parse_and_emit(data, payload_start=1)
                 return
         except Exception as e:
             LOG.debug("FlightPanel: feature report query failed: %s", e)
@@ -108,7 +164,8 @@ class FlightPanelReader:
         try:
             data = self._device.read(64, timeout_ms=500)
             if data:
-                LOG.debug("FlightPanel: captured initial state via blocking read: %s", ' '.join(f"{b:02x}" for b in data))
+                if self._debug:
+                    LOG.debug("FlightPanel: captured initial state via blocking read: %s", bytes(data).hex(' '))
                 self._parse_and_emit(data)
                 return
         except Exception as e:
@@ -119,47 +176,48 @@ class FlightPanelReader:
         self._emit_baseline_state()
 
     def _emit_baseline_state(self):
-        """Emit an all-false baseline state (once)."""
-        state = {
-            "device": "flightpanel",
-            "buttons": {idx: False for idx in range(20)},
-            "axes": {},
-            "hats": {},
-        }
-        self._emit(state)
-
-    def _parse_and_emit(self, data):
+        """Emit an all-released (0) baseline state (once)."""
+        for idx in self._buttons:
+            self._buttons[idx] = 0
+        self._prev_bits = None
+        self._emit(self._state)
+
+    def _parse_and_emit(self, data, payload_start=None):
         """Parse raw USB HID report from Flight Switch Panel.
         
         The Flight Switch Panel typically sends an 8-byte HID report where each byte
         represents switch/button states. Map the bits to logical switch indices.
+        `payload_start` is the number of leading report ID bytes; it defaults to
+        the value probed from the report descriptor when the device was opened.
         """
         if not data or len(data) < 3:
             return
         
-        # Simple parsing: treat bytes as switch state bits
-        # Flight panel has about 12 switches/buttons, map them to indices
-        state = {
-            "device": "flightpanel",
-            "buttons": {},
-            "axes": {},
-            "hats": {},
-        }
-        
+        if payload_start is None:
+            payload_start = self._payload_start
         # Decode HID report (varies by panel model; this is a typical layout)
-        # Byte 0 might be report ID, bytes 1-8 contain switch bits
-        for byte_idx, byte_val in enumerate(data[1:] if data[0] == 0 else data):  # skip report ID if present
-            for bit_idx in range(8):
-                if byte_idx * 8 + bit_idx < 20:  # reasonable max switches
-                    switch_idx = byte_idx * 8 + bit_idx
-                    state["buttons"][switch_idx] = bool((byte_val >> bit_idx) & 1)
-        
+        # Little-endian packing makes bit N of the int switch index N, and the
+        # shift drops any report ID byte without slicing (copying) the list.
+        bits = (int.from_bytes(data, "little") >> (8 * payload_start)) & SWITCH_MASK
+
         # Only emit if state changed
-        if state != self._last_state:
-            self._last_state = state
-            self._emit(state)
+        prev = self._prev_bits
+        if bits == prev:
+            return
+        # Visit just the switches that flipped (all of them for the first report)
+        buttons = self._buttons
+        diff = SWITCH_MASK if prev is None else bits ^ prev
+        for pos, lut in enumerate(_SWITCH_LUT):
+            for idx in lut[(diff >> (pos * 8)) & 0xFF]:
+                buttons[idx] = (bits >> idx) & 1
+        self._prev_bits = bits
+        self._emit(self._state)
 
     def _emit(self, state):
-        LOG.debug("FlightPanel: emit %r", state)
-        for cb in self._subs:
-            cb(state)
+        if self._debug:
+            LOG.debug("FlightPanel: emit %r", state)
+        try:
+            for cb in self._subs:
+                cb(state)
+        except Exception:
+            LOG.exception("subscriber callback failed")
@@ -21,16 +21,28 @@ L_LIGHT_BIT = 0x01  # Byte 2, bit 0 (for L position light)
 
 
 class FlightPanelLEDControl:
-    """Control Flight Panel LEDs via HID feature reports"""
+    """Control Flight Panel LEDs via HID feature reports
+
+    Setters only update the desired report and wake a writer thread, so the
+    caller (the vJoy loop) never blocks on the USB control transfer. The writer
+    always sends the latest desired report, coalescing bursts of changes.
+    """
     
     def __init__(self):
         self._device = None
         self._lock = threading.Lock()
-        self._current_state = None
+        self._desired_report = None
         self._last_report = None
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._writer_thread = None
         
     def connect(self):
         """Open connection to Flight Panel"""
+        if self._writer_thread is not None:
+            # A writer left behind by a timed-out disconnect still owns the old handle
+            LOG.warning("Previous LED writer still running; disconnect before reconnecting")
+            return False
         try:
             devices = hid.enumerate(LOGITECH_VID, FLIGHT_PANEL_PID)
             if not devices:
@@ -41,8 +53,15 @@ class FlightPanelLEDControl:
             self._device.open_path(devices[0]['path'])
             
             # Get initial state
-            self._current_state = self._device.get_feature_report(0, 64)
-            self._last_report = bytearray(self._current_state)
+            current = self._device.get_feature_report(0, 64)
+            self._last_report = bytes(current)
+            self._desired_report = bytearray(current)
+            self._stop.clear()
+            self._dirty.clear()
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, args=(self._device,), name="FlightPanelLEDWriter", daemon=True
+            )
+            self._writer_thread.start()
             LOG.info("Flight Panel LED control connected")
             return True
         except Exception as e:
@@ -51,7 +70,17 @@ class FlightPanelLEDControl:
             return False
     
     def disconnect(self):
-        """Close connection"""
+        """Flush any pending report, stop the writer and close the connection"""
+        if self._writer_thread:
+            self._stop.set()
+            self._dirty.set()
+            self._writer_thread.join(timeout=1.0)
+            if self._writer_thread.is_alive():
+                # Closing the handle under an in-flight send_feature_report is unsafe;
+                # keep both so a later disconnect() can finish the job
+                LOG.warning("LED writer did not stop within 1s; leaving the device open")
+                return
+            self._writer_thread = None
         if self._device:
             try:
                 self._device.close()
@@ -59,55 +88,63 @@ class FlightPanelLEDControl:
                 pass
             self._device = None
     
-    def set_n_light(self, on: bool):
-        """Control N position light"""
+    def _writer_loop(self, device):
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            with self._lock:
+                desired = bytes(self._desired_report)
+            if desired != self._last_report:
+                try:
+                    device.send_feature_report(desired)
+                    self._last_report = desired
+                except Exception as e:
+                    LOG.error("Failed to set lights: %s", e)
+            if self._stop.is_set():
+                return
+    
+    def set_lights(self, n=None, l=None):
+        """Set the N and/or L position lights with a single feature report.
+
+        `None` leaves that light as it is. The report is sent asynchronously by
+        the writer thread; re-asserting a state the device already shows costs
+        nothing, while re-asserting one whose send failed wakes the writer again.
+        """
         if not self._device:
             return False
         
         with self._lock:
-            try:
-                report = bytearray(self._last_report)
-                
-                if on:
+            report = self._desired_report
+            if n is not None:
+                if n:
                     report[1] |= N_LIGHT_BIT  # Set bit
                 else:
                     report[1] &= ~N_LIGHT_BIT  # Clear bit
-                
-                self._device.send_feature_report(report)
-                self._last_report = report
-                LOG.debug("N light: %s", "ON" if on else "OFF")
-                return True
-            except Exception as e:
-                LOG.error("Failed to set N light: %s", e)
-                return False
-    
-    def set_l_light(self, on: bool):
-        """Control L position light"""
-        if not self._device:
-            return False
-        
-        with self._lock:
-            try:
-                report = bytearray(self._last_report)
-                
-                if on:
+            if l is not None:
+                if l:
                     report[2] |= L_LIGHT_BIT  # Set bit
                 else:
                     report[2] &= ~L_LIGHT_BIT  # Clear bit
-                
-                self._device.send_feature_report(report)
-                self._last_report = report
-                LOG.debug("L light: %s", "ON" if on else "OFF")
+            # Compare with what was last sent, not the previous request, so a
+            # failed send is retried by the next call
+            if report == self._last_report:
                 return True
-            except Exception as e:
-                LOG.error("Failed to set L light: %s", e)
-                return False
+        LOG.debug("lights: N=%s L=%s", n, l)
+        self._dirty.set()
+        return True
+    
+    def set_n_light(self, on: bool):
+        """Control N position light"""
+        return self.set_lights(n=on)
+    
+    def set_l_light(self, on: bool):
+        """Control L position light"""
+        return self.set_lights(l=on)
     
     def set_landing_gear(self, down: bool):
         """Set landing gear lights based on position (proxy for N+L lights)"""
-        # Typically both N and L light up when gear is down
-        self.set_n_light(down)
-        self.set_l_light(down)
+        # Typically both N and L light up when gear is down; one report for both
+        return self.set_lights(n=down, l=down)
 
 
 # Test/demo
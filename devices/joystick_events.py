@@ -0,0 +1,121 @@
+"""Shared pygame joystick event pump
+
+SDL keeps a single process-wide event queue, so the X-55 and CH Throttle readers
+cannot each drain it without stealing one another's events. `JoystickEventPump`
+owns the queue on one thread, blocks inside SDL until something arrives and
+hands each reader only the events for its own joystick instance id.
+"""
+import threading
+import logging
+
+try:
+    import pygame
+except Exception:
+    pygame = None
+
+LOG = logging.getLogger("flightbridge.joystick_events")
+
+# Upper bound on how long the pump blocks in SDL. Shutdown posts a wake-up
+# event, so this is only a safety net and can be generous.
+WAIT_TIMEOUT_MS = 500
+
+
+class JoystickEventPump:
+    """Routes pygame joystick events to per-instance handlers.
+
+    Handlers are called on the pump thread with the list of events drained for
+    their joystick in one wake-up, so a burst of axis motion is applied (and
+    emitted) once rather than once per event.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._lock = threading.Lock()
+        self._t = None
+        self._stop = threading.Event()
+
+    def register(self, instance_id, handler):
+        with self._lock:
+            self._handlers[instance_id] = handler
+            # Cancels a stop requested by the last unregister; a pump thread that
+            # has not yet acted on it keeps running (see `_loop`)
+            self._stop.clear()
+            if self._t is None:
+                self._t = threading.Thread(target=self._loop, name="JoystickEventPump", daemon=True)
+                self._t.start()
+
+    def unregister(self, instance_id):
+        with self._lock:
+            self._handlers.pop(instance_id, None)
+            if not self._handlers:
+                self._stop.set()
+                self._wake()
+
+    def _wake(self):
+        # Unblock pygame.event.wait() so the pump notices the stop flag now
+        try:
+            pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        except Exception:
+            LOG.debug("could not post wake-up event; pump stops on next timeout")
+
+    def _loop(self):
+        pygame.event.set_allowed([
+            pygame.JOYAXISMOTION,
+            pygame.JOYBUTTONDOWN,
+            pygame.JOYBUTTONUP,
+            pygame.JOYHATMOTION,
+            pygame.JOYDEVICEREMOVED,
+            pygame.USEREVENT,
+        ])
+        while True:
+            # Decide to exit under the lock, so a concurrent register() either
+            # cancels the stop in time or sees `_t` cleared and starts a new pump
+            with self._lock:
+                if self._stop.is_set():
+                    self._t = None
+                    return
+            try:
+                ev = pygame.event.wait(WAIT_TIMEOUT_MS)
+                if ev.type == pygame.NOEVENT or ev.type == pygame.USEREVENT:
+                    continue
+                batches = {}
+                for e in [ev] + pygame.event.get():
+                    batches.setdefault(getattr(e, "instance_id", None), []).append(e)
+                for instance_id, events in batches.items():
+                    handler = self._handlers.get(instance_id)
+                    if handler is None:
+                        continue
+                    try:
+                        handler(events)
+                    except Exception:
+                        LOG.exception("joystick event handler failed")
+            except Exception:
+                LOG.exception("error in joystick event pump")
+                self._stop.wait(1.0)
+
+
+_pump = None
+_pump_lock = threading.Lock()
+
+
+def init_joystick_subsystem():
+    """Bring up only the SDL subsystems the readers need.
+
+    `pygame.init()` also starts audio, fonts and friends; the event queue only
+    needs the display subsystem (SDL ties it to video) plus the joystick one.
+    Both calls are no-ops once initialised, so reconnect scans can call this
+    freely.
+    """
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if not pygame.joystick.get_init():
+        pygame.joystick.init()
+
+
+def shared_pump():
+    """Return the process-wide `JoystickEventPump`, creating it on first use."""
+    global _pump
+    with _pump_lock:
+        if _pump is None:
+            _pump = JoystickEventPump()
+        return _pump
@@ -1,10 +1,9 @@
 """X-55 reader using DirectInput via pygame.joystick
 
-This module provides a simple `X55Reader` that polls axes/buttons/hats and emits
-normalized DeviceState dictionaries to subscribers.
+This module provides a simple `X55Reader` that tracks axes/buttons/hats from SDL
+joystick events and emits normalized DeviceState dictionaries to subscribers.
 """
 import threading
-import time
 import logging
 
 try:
@@ -12,6 +11,8 @@ try:
 except Exception:
     pygame = None
 
+from devices.joystick_events import init_joystick_subsystem, shared_pump
+
 LOG = logging.getLogger("flightbridge.x55")
 
 
@@ -22,23 +23,33 @@ class X55Reader:
       {
         'device': 'x55',
         'axes': {0: float, 1: float, ...},
-        'buttons': {0: bool, 1: bool, ...},
+        'buttons': {0: int, 1: int, ...},  # 1 pressed, 0 released
         'hats': {0: (x,y), ...}
       }
+
+    A state is emitted once on connect and then only when SDL reports a change.
+    The same dict is emitted every time and updated in place, so subscribers that
+    keep a reference see the live state; they must not mutate it.
     """
 
     def __init__(self):
-        self._subs = []
+        self._subs = ()  # copy-on-write: subscribe() swaps in a new tuple, emits just read it
+        # Cached so emits skip the logger level walk; refreshed in start()
+        self._debug = LOG.isEnabledFor(logging.DEBUG)
         self._t = None
         self._stop = threading.Event()
         self._joystick = None
+        # Single state dict emitted on every change and updated in place
+        self._axes = {}
+        self._buttons = {}
+        self._hats = {}
+        self._state = {"device": "x55", "axes": self._axes, "buttons": self._buttons, "hats": self._hats}
 
     def _find_x55(self):
         if pygame is None:
             LOG.warning("pygame not available — X55Reader disabled")
             return None
-        pygame.init()
-        pygame.joystick.init()
+        init_joystick_subsystem()
         for i in range(pygame.joystick.get_count()):
             js = pygame.joystick.Joystick(i)
             js.init()
@@ -50,49 +61,96 @@ class X55Reader:
         return None
 
     def subscribe(self, callback):
-        self._subs.append(callback)
+        self._subs = self._subs + (callback,)
 
     def start(self):
         self._stop.clear()
-        self._joystick = self._find_x55()
+        self._debug = LOG.isEnabledFor(logging.DEBUG)
+        try:
+            js = self._find_x55()
+            if js:
+                self._attach(js)
+        except Exception:
+            # Leave it to the reconnect scan in _loop rather than failing app startup
+            LOG.exception("error connecting to X55; will retry")
         self._t = threading.Thread(target=self._loop, name="X55Reader", daemon=True)
         self._t.start()
 
     def stop(self):
         self._stop.set()
+        self._detach()
         if self._t:
             self._t.join(timeout=1.0)
 
-    def _emit(self, state):
-        LOG.debug("x55 raw state -> %s", state)
-        for cb in self._subs:
-            try:
+    def _attach(self, js):
+        """Snapshot the joystick once, then follow it through the event pump."""
+        axes, buttons, hats = self._axes, self._buttons, self._hats
+        axes.clear()
+        buttons.clear()
+        hats.clear()
+        for i in range(js.get_numaxes()):
+            axes[i] = js.get_axis(i)
+        for i in range(js.get_numbuttons()):
+            buttons[i] = js.get_button(i)
+        for i in range(js.get_numhats()):
+            hats[i] = js.get_hat(i)
+        self._joystick = js
+        shared_pump().register(js.get_instance_id(), self._on_events)
+        self._emit_state()
+
+    def _detach(self):
+        js = self._joystick
+        self._joystick = None
+        if js is not None:
+            shared_pump().unregister(js.get_instance_id())
+
+    def _emit_state(self):
+        state = self._state
+        if self._debug:
+            LOG.debug("x55 raw state -> %s", state)
+        try:
+            for cb in self._subs:
                 cb(state)
-            except Exception:
-                LOG.exception("subscriber callback failed")
+        except Exception:
+            LOG.exception("subscriber callback failed")
+
+    def _on_events(self, events):
+        """Apply one batch of SDL events for our joystick (pump thread), then emit once.
+
+        Nothing is emitted when none of the events actually changes a value.
+        """
+        axes, buttons, hats = self._axes, self._buttons, self._hats
+        changed = False
+        for ev in events:
+            t = ev.type
+            if t == pygame.JOYAXISMOTION:
+                target, key, value = axes, ev.axis, ev.value
+            elif t == pygame.JOYBUTTONDOWN:
+                target, key, value = buttons, ev.button, 1
+            elif t == pygame.JOYBUTTONUP:
+                target, key, value = buttons, ev.button, 0
+            elif t == pygame.JOYHATMOTION:
+                target, key, value = hats, ev.hat, ev.value
+            elif t == pygame.JOYDEVICEREMOVED:
+                LOG.warning("X-55 disconnected; will attempt reconnect")
+                self._detach()
+                return
+            else:
+                continue
+            if target.get(key) != value:
+                target[key] = value
+                changed = True
+        if changed:
+            self._emit_state()
 
     def _loop(self):
-        if self._joystick is None:
-            # try reconnect logic
-            while not self._stop.is_set():
-                self._joystick = self._find_x55()
-                if self._joystick:
-                    break
-                time.sleep(1.0)
+        # Input arrives through the shared event pump; this thread only (re)connects.
         while not self._stop.is_set():
-            try:
-                pygame.event.pump()
-                js = self._joystick
-                if js is None:
-                    time.sleep(0.5)
-                    continue
-                axes = {i: js.get_axis(i) for i in range(js.get_numaxes())}
-                buttons = {i: bool(js.get_button(i)) for i in range(js.get_numbuttons())}
-                hats = {i: js.get_hat(i) for i in range(js.get_numhats())}
-                state = {"device": "x55", "axes": axes, "buttons": buttons, "hats": hats}
-                self._emit(state)
-                time.sleep(1.0 / 120.0)
-            except Exception:
-                LOG.exception("error reading X55; will attempt reconnect")
-                self._joystick = None
-                time.sleep(1.0)
+            if self._joystick is None:
+                try:
+                    js = self._find_x55()
+                    if js:
+                        self._attach(js)
+                except Exception:
+                    LOG.exception("error connecting to X55; will retry")
+            self._stop.wait(1.0)
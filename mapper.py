@@ -1,542 +1,580 @@
 """Mapping engine: load YAML profiles and map DeviceState -> VJoyCommand"""
 import yaml
+import copy
+import functools
+import heapq
+import itertools
 import logging
+import os
 import time
+import types
+from typing import NamedTuple, Optional, Tuple, Union
 from core.state import VJoyCommand
 
+try:
+    # libyaml-backed loader; PyYAML wheels ship it, source builds may not
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 LOG = logging.getLogger("flightbridge.mapper")
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_profile(path: str, mtime_ns: int, size: int):
+    """Parse a profile file; keyed on its stat so an edited file is re-read."""
+    # Hand libyaml the raw bytes; it decodes UTF-8 itself, skipping a Python-level pass
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+# Input prefixes understood by the event pass: (prefix, owning device, kind).
+# "button" inputs mirror their state straight to the target, "switch" inputs
+# (flight panel) additionally support toggle/pulse mode.
+_SOURCE_KINDS = (
+    ("x55.axes", "x55", "axis"),
+    ("x55.button", "x55", "button"),
+    ("x55.hat", "x55", "hat"),
+    ("flightpanel.switch", "flightpanel", "switch"),
+    ("flightpanel.button", "flightpanel", "switch"),
+    ("ch_throttle.axes", "ch_throttle", "axis"),
+    ("ch_throttle.button", "ch_throttle", "button"),
+    ("flightpanel.axis", "flightpanel", "axis"),
+)
+
+# pygame hat is tuple (x, y) like (-1, -1), (0, 1), (1, 0), etc.
+# convert to degrees: -1 = centered, 0 = up, 90 = right, 180 = down, 270 = left
+_HAT_DEGREES = {
+    (0, 0): -1,  # centered
+    (0, 1): 0,  # up
+    (1, 1): 45,  # up-right
+    (1, 0): 90,  # right
+    (1, -1): 135,  # down-right
+    (0, -1): 180,  # down
+    (-1, -1): 225,  # down-left
+    (-1, 0): 270,  # left
+    (-1, 1): 315,  # up-left
+}
+
+# Switch states that fire a toggle pulse, per `trigger` prop; unknown triggers never fire
+_TRIGGER_STATES = {
+    "on_change": (True, False),
+    "on_press": (True,),
+    "on_release": (False,),
+}
+
+# Stand-in for a missing axes/buttons/hats section; read-only so it can be shared
+_EMPTY = types.MappingProxyType({})
+
+# Compiled binding records. Targets are resolved at load: `tgt` is a button/pov
+# id, an axis or LED name, or a tuple of key names, depending on `tgt_kind`.
+Target = Union[int, str, Tuple[str, ...], None]
+
+
+class AxisBinding(NamedTuple):
+    idx: int
+    axis: str
+    factor: float  # scale, negated for invert
+
+
+class ButtonBinding(NamedTuple):
+    idx: int
+    tgt_kind: Optional[str]
+    tgt: Target
+
+
+class HatBinding(NamedTuple):
+    idx: int
+    pov: int
+
+
+class SwitchBinding(NamedTuple):
+    state_key: str
+    bit: int  # the switch's bit in the input bitset
+    tgt_kind: str  # "button" or "key"
+    tgt: Target
+    toggle: bool
+    fires_on: Tuple[bool, ...]  # switch states that trigger a pulse
+    trigger: str
+    pulse_ms: int
+    pulse_s: float
+    target: str  # original target string, for logging
+
+
+class MultiBinding(NamedTuple):
+    sources: Tuple[str, ...]
+    mask: int  # bits of `sources` in the input bitset
+    logic: str
+    all_same: bool
+    tgt_kind: Optional[str]
+    tgt: Target
+    toggle: bool
+    pulse_ms: int
+    pulse_s: float
+    state_key: str
+    target: str  # original target string, for logging
+
+
+class DirectBinding(NamedTuple):
+    tgt_kind: str  # "button", "key" or "led"
+    tgt: Target
+    sources: Tuple[str, ...]
+    mask: int  # bits of `sources` in the input bitset
+    logic: Optional[str]  # None for a single input
+    outputs: Tuple[Tuple[dict, object], ...] = ()  # (output dict, key) pairs this binding decides
+
+
+def _direct_condition(state_bits: int, mask: int, logic) -> bool:
+    """Evaluate a direct/LED binding from the cached input bitset."""
+    held = state_bits & mask
+    if logic == "all_same":
+        # Fire when ALL inputs are true OR ALL inputs are false
+        return held == mask or not held
+    # Default AND logic; a single input is an AND over one bit
+    return held == mask
+
+
 class Mapper:
+    # Attribute access on the hot path goes through slot descriptors, not a __dict__
+    __slots__ = (
+        "profile",
+        "_state_bits",
+        "_input_bits",
+        "_toggle_state",
+        "_button_pulses",
+        "_key_pulses",
+        "_pulse_heap",
+        "_pulse_seq",
+        "_axis_bindings",
+        "_button_bindings",
+        "_hat_bindings",
+        "_switch_bindings",
+        "_multi_bindings",
+        "_direct_bindings",
+        "_direct_deps",
+        "_direct_buttons",
+        "_direct_keys",
+        "_direct_leds",
+        "_tracked_inputs",
+        "_dirty_direct",
+    )
+
     def __init__(self, profile: dict):
         self.profile = profile
-        self._prev_state = {}  # Track previous state for toggle mode detection
-        self._pulse_timers = {}  # Track active pulses: {button_id: end_time}
+        # Cached digital inputs across all devices, one bit per input (see `_input_bits`)
+        self._state_bits = 0
+        self._toggle_state = {}  # Last seen switch/condition per toggle binding, for edge detection
+        # Active pulses, {button_id: end_time} and {key_name: end_time}
+        self._button_pulses = {}
+        self._key_pulses = {}
+        # Min-heap of (end_time, seq, pulses dict, id) so expiry only looks at due
+        # pulses; entries superseded by a re-armed pulse are skipped when popped
+        self._pulse_heap = []
+        self._pulse_seq = itertools.count()
+        self._dirty_direct = set()  # DirectBinding indices whose inputs changed this tick
+        self._compile(profile.get("bindings", []))
 
     @staticmethod
     def _key_names_from_target(tgt: str):
         """Return list of key names from a target like 'key:space' or 'key:shift key:c'."""
-        if not tgt.startswith("key:"):
+        kind, _, remainder = tgt.partition(":")
+        if kind != "key":
             return []
-        remainder = tgt.split(":", 1)[1]
         key_names = []
         for token in remainder.split():
-            if not token:
-                continue
             # Allow optional repeated key: prefixes in the list
             if token.startswith("key:"):
-                token = token.split(":", 1)[1]
+                token = token[4:]
             if token:
                 key_names.append(token)
         return key_names
 
-    def _refresh_state_from_event(self, src_item: str, device_name: str, state: dict):
-        """Update cached state for a source if the current event owns it."""
-        if src_item.startswith("x55.button") and device_name == "x55":
-            idx = int(src_item.split(".")[-1])
-            st = bool(state.get("buttons", {}).get(idx, False))
-            self._prev_state[src_item] = st
-            return st, True
-        if (src_item.startswith("flightpanel.switch") or src_item.startswith("flightpanel.button")) and device_name == "flightpanel":
-            idx = int(src_item.split(".")[-1])
-            st = bool(state.get("buttons", {}).get(idx, False))
-            self._prev_state[src_item] = st
-            return st, True
-        if src_item.startswith("ch_throttle.button") and device_name == "ch_throttle":
-            idx = int(src_item.split(".")[-1])
-            st = bool(state.get("buttons", {}).get(idx, False))
-            self._prev_state[src_item] = st
-            return st, True
-        return self._prev_state.get(src_item, False), False
+    @classmethod
+    def _parse_target(cls, tgt: str):
+        """Split a target string into (kind, value), e.g. 'button:3' -> ('button', 3).
+
+        Keys resolve to a tuple of key names; unknown kinds give (None, None).
+        """
+        kind, _, name = tgt.partition(":")
+        if kind in ("button", "pov"):
+            return kind, int(name)
+        if kind == "key":
+            return kind, tuple(cls._key_names_from_target(tgt))
+        if kind in ("axis", "led"):
+            return kind, name
+        return None, None
+
+    def _track_input(self, src: str):
+        """Register an input read through the cached state and return its name.
+
+        Digital inputs are refreshed from their device's `buttons` once per
+        event; anything else is never refreshed and always reads as False.
+        Inputs no device produces are reported here, once at load.
+
+        Every input gets a bit in the cached bitset, so multi-input and direct
+        conditions are evaluated with a mask instead of per-input lookups.
+        """
+        bit = self._input_bits.setdefault(src, 1 << len(self._input_bits))
+        for prefix, device, kind in _SOURCE_KINDS:
+            if src.startswith(prefix):
+                if kind in ("button", "switch"):
+                    self._tracked_inputs.setdefault(device, {})[bit] = int(src.rpartition(".")[2])
+                break
+        else:
+            LOG.warning("binding input %s does not match any known device; it will never fire", src)
+        return src
+
+    def _compile(self, bindings):
+        """Parse every binding once into per-device dispatch tables.
+
+        `map_state_to_vjoy` then only walks the entries fed by the device that
+        produced the state, unpacking typed records: no string parsing and no
+        props lookups per call. Within each table the profile order is kept.
+
+        Malformed bindings raise ValueError here, naming the binding, so the
+        per-event loops can run without exception handling.
+        """
+        self._axis_bindings = {}  # device -> [AxisBinding]
+        self._button_bindings = {}  # device -> [ButtonBinding]
+        self._hat_bindings = {}  # device -> [HatBinding]
+        self._switch_bindings = {}  # device -> [SwitchBinding]
+        self._multi_bindings = {}  # device -> [MultiBinding]
+        # Direct buttons/keys and LEDs, re-asserted on every call from the cached input state
+        self._direct_bindings = []  # [DirectBinding]
+        self._input_bits = {}  # input name -> its bit in `_state_bits`
+        self._tracked_inputs = {}  # device -> {bit: idx} digital inputs the cached state must follow
+
+        for n, b in enumerate(bindings):
+            try:
+                self._compile_binding(n, b)
+            except (ValueError, TypeError, AttributeError) as e:
+                raise ValueError(f"invalid binding #{n} {b!r}: {e}") from e
+        self._tracked_inputs = {device: tuple(inputs.items()) for device, inputs in self._tracked_inputs.items()}
+        self._index_direct_outputs()
+
+        if LOG.isEnabledFor(logging.DEBUG):
+            for device in sorted(set(self._axis_bindings) | set(self._button_bindings) | set(self._hat_bindings)
+                                 | set(self._switch_bindings) | set(self._multi_bindings)):
+                LOG.debug("%s: %d axis, %d button, %d hat, %d switch, %d multi-input bindings", device,
+                          len(self._axis_bindings.get(device, ())), len(self._button_bindings.get(device, ())),
+                          len(self._hat_bindings.get(device, ())), len(self._switch_bindings.get(device, ())),
+                          len(self._multi_bindings.get(device, ())))
+            LOG.debug("%d direct outputs over %d inputs", len(self._direct_bindings), len(self._input_bits))
+
+    def _index_direct_outputs(self):
+        """Resolve which direct binding decides each output and what it depends on.
+
+        Direct outputs are written after everything else, so when several
+        bindings target the same button/key/LED only the last one in the profile
+        counts. Each remaining binding's value is cached in the output dicts and
+        only recomputed when one of its inputs changes (see `_direct_deps`).
+        """
+        self._direct_buttons = {}
+        self._direct_keys = {}
+        self._direct_leds = {}
+        outputs_of = {"button": self._direct_buttons, "key": self._direct_keys, "led": self._direct_leds}
+
+        owner = {}
+        for i, d in enumerate(self._direct_bindings):
+            names = d.tgt if d.tgt_kind == "key" else (d.tgt,)
+            for name in names:
+                owner[(d.tgt_kind, name)] = i
+
+        decided = {}
+        for (tgt_kind, name), i in owner.items():
+            decided.setdefault(i, []).append((outputs_of[tgt_kind], name))
+        direct = []
+        deps = {}
+        for i, d in enumerate(self._direct_bindings):
+            if i not in decided:
+                continue
+            for src in dict.fromkeys(d.sources):
+                deps.setdefault(self._input_bits[src], []).append(len(direct))
+            direct.append(d._replace(outputs=tuple(decided[i])))
+        self._direct_bindings = direct
+        self._direct_deps = {bit: tuple(ids) for bit, ids in deps.items()}
+
+        # Seed the outputs for an empty input cache (everything released)
+        for d in direct:
+            current = _direct_condition(self._state_bits, d.mask, d.logic)
+            for out, name in d.outputs:
+                out[name] = current
+
+    def _compile_binding(self, n, b):
+        # Support both 'input' (single) and 'inputs' (multiple)
+        src = b.get("input")
+        inputs = b.get("inputs")
+        src_list = inputs if inputs is not None else ([src] if src else [])
+        tgt = b.get("target")  # e.g. 'axis:AXIS_X' or 'button:1'
+        props = b.get("props", {})
+        if not tgt:
+            LOG.debug("skipping incomplete binding: %s", b)
+            return
+
+        tgt_kind, tgt_value = self._parse_target(tgt)
+        mode = props.get("mode", "direct")  # "direct" or "toggle"
+        toggle = mode == "toggle"
+        pulse_ms = props.get("pulse_ms", 100)  # default 100ms pulse
+        logic = props.get("logic", "and")  # "and" or "all_same"
+        multi = not (src and not inputs)
+
+        if multi:
+            if not src_list:
+                return
+            sources = tuple(self._track_input(item) for item in src_list)
+            # Direct-mode outputs are settled by the direct pass alone; the event
+            # pass only needs the ones that pulse (or use another mode)
+            if tgt_kind in ("button", "key") and mode != "direct":
+                # Edge state is kept per binding: two toggles on the same target
+                # (e.g. "key:shift key:k" twice in allegiance.yaml) each fire on their own edge
+                entry = MultiBinding(sources, self._mask_of(sources), logic, logic == "all_same", tgt_kind, tgt_value,
+                                     toggle, pulse_ms, pulse_ms / 1000.0, f"multi:{n}:{tgt}", tgt)
+                # Only states from a device the binding reads can change its inputs, so it
+                # is evaluated (and can first fire) once one of those devices reports.
+                # E.g. an all_same toggle over flight panel switches pulses on the first
+                # flight panel report, not on whichever device happens to report first.
+                for device in dict.fromkeys(item.partition(".")[0] for item in src_list):
+                    self._multi_bindings.setdefault(device, []).append(entry)
+        else:
+            sources = (self._track_input(src),)
+            logic = None
+            self._compile_single(src, tgt, tgt_kind, tgt_value, props, toggle, pulse_ms)
+
+        # Outputs re-asserted on every call, whichever device produced the state
+        if (tgt_kind in ("button", "key") and mode == "direct") or tgt_kind == "led":
+            self._direct_bindings.append(DirectBinding(tgt_kind, tgt_value, sources, self._mask_of(sources), logic))
+
+    def _mask_of(self, sources) -> int:
+        mask = 0
+        for src in sources:
+            mask |= self._input_bits[src]
+        return mask
+
+    def _input_states(self, sources):
+        """Current cached state of each input, for log messages."""
+        bits = self._state_bits
+        return [bool(bits & self._input_bits[src]) for src in sources]
+
+    def _compile_single(self, src, tgt, tgt_kind, tgt_value, props, toggle, pulse_ms):
+        for prefix, device, kind in _SOURCE_KINDS:
+            if src.startswith(prefix):
+                break
+        else:
+            return
+        idx = int(src.rpartition(".")[2])
+
+        if kind == "axis":
+            if tgt_kind == "axis":
+                factor = float(props.get("scale", 1.0))
+                if props.get("invert"):
+                    factor = -factor
+                entry = AxisBinding(idx, tgt_value, factor)
+                self._axis_bindings.setdefault(device, []).append(entry)
+        elif kind == "button":
+            entry = ButtonBinding(idx, tgt_kind, tgt_value)
+            self._button_bindings.setdefault(device, []).append(entry)
+        elif kind == "hat":
+            if tgt_kind == "pov":
+                self._hat_bindings.setdefault(device, []).append(HatBinding(idx, tgt_value))
+        elif tgt_kind in ("button", "key"):
+            trigger = props.get("trigger", "on_change")  # "on_press", "on_release", or "on_change"
+            entry = SwitchBinding(f"{prefix}.{idx}", self._input_bits[src], tgt_kind, tgt_value, toggle, _TRIGGER_STATES.get(trigger, ()),
+                                  trigger, pulse_ms, pulse_ms / 1000.0, tgt)
+            self._switch_bindings.setdefault(device, []).append(entry)
+
+    def _arm_pulse(self, pulses: dict, timer_id, end_time: float):
+        pulses[timer_id] = end_time
+        heapq.heappush(self._pulse_heap, (end_time, next(self._pulse_seq), pulses, timer_id))
+
+    def _pulse_target(self, tgt_kind: str, tgt, end_time: float):
+        """Hold a toggle binding's button or keys pressed until `end_time`."""
+        if tgt_kind == "button":
+            self._arm_pulse(self._button_pulses, tgt, end_time)
+        else:
+            for key_name in tgt:
+                self._arm_pulse(self._key_pulses, key_name, end_time)
+
+    def has_pending_pulses(self) -> bool:
+        """True while toggle-mode pulses are armed and still need expiring."""
+        return bool(self._button_pulses or self._key_pulses)
 
     @classmethod
     def load_profile(cls, path: str):
-        with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        return cls(data)
+        # Repeat loads of an unchanged file skip parsing; each Mapper still gets its own copy
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        return cls(copy.deepcopy(_parse_profile(path, st.st_mtime_ns, st.st_size)))
 
     def map_state_to_vjoy_full(self, all_states: dict) -> VJoyCommand:
         """Map accumulated state from all devices to vJoy command"""
         cmd = VJoyCommand()
-        
-        # Process each device's state
+        now = time.monotonic()  # one clock read per tick, for arming and expiring pulses
+
+        # Every device writes straight into the shared command; pulses and
+        # direct outputs only need settling once, after all inputs are cached
         for device_name, state in all_states.items():
-            state_with_device = {**state, "device": device_name}
-            device_cmd = self.map_state_to_vjoy(state_with_device)
-            
-            # Merge commands (buttons, axes, povs, keys, leds)
-            cmd.buttons.update(device_cmd.buttons)
-            cmd.axes.update(device_cmd.axes)
-            cmd.povs.update(device_cmd.povs)
-            cmd.keys.update(device_cmd.keys)
-            cmd.leds.update(device_cmd.leds)
-        
+            self._apply_device(state, device_name, cmd, now)
+        self._apply_pulses_and_direct(cmd, now)
+
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug("mapped state -> %s", cmd)
         return cmd
 
-    def map_state_to_vjoy(self, state) -> VJoyCommand:
-        # Very small reference implementation: look for axis bindings and button bindings
+    def map_state_to_vjoy(self, state: dict, device_name: Optional[str] = None) -> VJoyCommand:
+        """Map a single device's state to a vJoy command.
+
+        The device name is taken from `device_name`, or from `state["device"]`
+        when not given.
+        """
+        if device_name is None:
+            device_name = state.get("device")
         cmd = VJoyCommand()
-        bindings = self.profile.get("bindings", [])
-        # device state is a simple dict with `device` key for now
-        device_name = state.get("device")
-        for b in bindings:
-            # Support both 'input' (single) and 'inputs' (multiple)
-            src = b.get("input")
-            src_list = b.get("inputs", [src] if src else [])
-            tgt = b.get("target")  # e.g. 'axis:AXIS_X' or 'button:1'
-            props = b.get("props", {})
-            
-            # Process single inputs
-            if src and not b.get("inputs"):
-                if not src or not tgt:
-                    LOG.debug("skipping incomplete binding: %s", b)
+        now = time.monotonic()
+        self._apply_device(state, device_name, cmd, now)
+        self._apply_pulses_and_direct(cmd, now)
+
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug("mapped state -> %s", cmd)
+        return cmd
+
+    def _apply_device(self, state: dict, device_name: str, cmd: VJoyCommand, now: float):
+        """Write the outputs fed by one device's state into `cmd`.
+
+        Also refreshes the cached inputs the device owns, arms toggle pulses
+        and marks the direct bindings whose inputs changed.
+        """
+        axes = state.get("axes") or _EMPTY
+        buttons = state.get("buttons") or _EMPTY
+        hats = state.get("hats") or _EMPTY
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        # Locals for everything the loops below touch per binding
+        out_axes, out_buttons, out_keys = cmd.axes, cmd.buttons, cmd.keys
+        out_povs, out_leds = cmd.povs, cmd.leds
+        toggle_state = self._toggle_state
+        pulse_target = self._pulse_target
+
+        for idx, axis_name, factor in self._axis_bindings.get(device_name, ()):
+            val = axes.get(idx, 0.0) * factor
+            # clamp
+            if val > 1.0:
+                val = 1.0
+            elif val < -1.0:
+                val = -1.0
+            out_axes[axis_name] = val
+
+        for idx, tgt_kind, tgt in self._button_bindings.get(device_name, ()):
+            st = bool(buttons.get(idx, False))
+            if tgt_kind == "button":
+                out_buttons[tgt] = st
+            elif tgt_kind == "key":
+                for key_name in tgt:
+                    out_keys[key_name] = st
+            elif tgt_kind == "led":
+                out_leds[tgt] = st
+
+        for idx, pov_id in self._hat_bindings.get(device_name, ()):
+            hat_val = hats.get(idx, (-1, -1))
+            deg = _HAT_DEGREES.get(hat_val, -1)  # anything unexpected reads as centered
+            out_povs[pov_id] = deg
+            if debug:
+                LOG.debug("mapped hat %s -> pov %d (%s -> %d°)", hat_val, pov_id, hat_val, deg)
+
+        # Refresh the cached inputs this device owns once; from here on every
+        # binding reads inputs from the cache, whichever device they belong to.
+        # Direct outputs depending on an input that changed get recomputed below.
+        old_bits = bits = self._state_bits
+        direct_deps = self._direct_deps
+        dirty = self._dirty_direct
+        for bit, idx in self._tracked_inputs.get(device_name, ()):
+            st = bit if buttons.get(idx, False) else 0
+            if bits & bit != st:
+                bits ^= bit
+                deps = direct_deps.get(bit)
+                if deps:
+                    dirty.update(deps)
+        self._state_bits = bits
+        changed = bits ^ old_bits
+
+        # Flight panel switches/buttons: direct mode only records the state (applied
+        # below), toggle mode pulses the target when the trigger condition is met.
+        # A switch that did not change since it was last recorded has nothing to do.
+        for state_key, bit, tgt_kind, tgt, toggle, fires_on, trigger, pulse_ms, pulse_s, target in self._switch_bindings.get(device_name, ()):
+            if not changed & bit and state_key in toggle_state:
+                continue
+            st = bool(bits & bit)
+            if toggle:
+                prev_st = toggle_state.get(state_key, None)
+                if debug and tgt_kind == "button":
+                    LOG.debug("%s toggle check: prev_st=%s, st=%s, tgt=%s", state_key, prev_st, st, target)
+
+                # Pulse when the state changed (or on the first report) into a triggering state
+                if prev_st != st and st in fires_on:
+                    pulse_target(tgt_kind, tgt, now + pulse_s)
+                    if debug:
+                        LOG.debug("%s changed %s->%s (trigger:%s), pulsing %s for %dms",
+                                  state_key, prev_st, st, trigger, target, pulse_ms)
+            toggle_state[state_key] = st
+
+        # Multiple inputs (AND / ALL_SAME logic), evaluated on the masked bitset.
+        # A toggle whose inputs did not change cannot see an edge, so it is
+        # skipped once its condition has been recorded.
+        for sources, mask, logic, all_same, tgt_kind, tgt, toggle, pulse_ms, pulse_s, multi_state_key, target in self._multi_bindings.get(device_name, ()):
+            if toggle and not changed & mask and multi_state_key in toggle_state:
+                continue
+            held = bits & mask
+            current_condition = held == mask or (all_same and not held)
+            states = self._input_states(sources) if debug else None
+            if toggle:
+                if toggle_state.get(multi_state_key) == current_condition:
                     continue
-                try:
-                    if src.startswith("x55.axes") and device_name == "x55":
-                        idx = int(src.split(".")[-1])
-                        val = state.get("axes", {}).get(idx, 0.0)
-                        val = float(val)
-                        if props.get("invert"):
-                            val = -val
-                        val = val * float(props.get("scale", 1.0))
-                        # clamp
-                        val = max(-1.0, min(1.0, val))
-                        if tgt.startswith("axis:"):
-                            axis_name = tgt.split(":", 1)[1]
-                            cmd.axes[axis_name] = val
-                    if src.startswith("x55.button") and device_name == "x55":
-                        idx = int(src.split(".")[-1])
-                        st = bool(state.get("buttons", {}).get(idx, False))
-                        self._prev_state[src] = st
-                        if tgt.startswith("button:"):
-                            btn_id = int(tgt.split(":", 1)[1])
-                            cmd.buttons[btn_id] = st
-                        elif tgt.startswith("key:"):
-                            for key_name in self._key_names_from_target(tgt):
-                                cmd.keys[key_name] = st
-                        elif tgt.startswith("led:"):
-                            led_name = tgt.split(":", 1)[1]
-                            cmd.leds[led_name] = st
-                    if src.startswith("x55.hat") and device_name == "x55":
-                        idx = int(src.split(".")[-1])
-                        hat_val = state.get("hats", {}).get(idx, (-1, -1))
-                        # pygame hat is tuple (x, y) like (-1, -1), (0, 1), (1, 0), etc.
-                        # convert to degrees: -1 = centered, 0 = up, 90 = right, 180 = down, 270 = left
-                        if hat_val == (0, 0):
-                            deg = -1  # centered
-                        elif hat_val == (0, 1):
-                            deg = 0  # up
-                        elif hat_val == (1, 1):
-                            deg = 45  # up-right
-                        elif hat_val == (1, 0):
-                            deg = 90  # right
-                        elif hat_val == (1, -1):
-                            deg = 135  # down-right
-                        elif hat_val == (0, -1):
-                            deg = 180  # down
-                        elif hat_val == (-1, -1):
-                            deg = 225  # down-left
-                        elif hat_val == (-1, 0):
-                            deg = 270  # left
-                        elif hat_val == (-1, 1):
-                            deg = 315  # up-left
-                        else:
-                            deg = -1  # default centered
-                        if tgt.startswith("pov:"):
-                            pov_id = int(tgt.split(":", 1)[1])
-                            cmd.povs[pov_id] = deg
-                            LOG.debug("mapped hat %s -> pov %d (%s -> %d°)", hat_val, pov_id, hat_val, deg)
-                    if src.startswith("flightpanel.switch") and device_name == "flightpanel":
-                        idx = int(src.split(".")[-1])
-                        st = bool(state.get("buttons", {}).get(idx, False))
-                        
-                        # Get mapping mode and pulse duration
-                        mode = props.get("mode", "direct")  # "direct" or "toggle"
-                        pulse_ms = props.get("pulse_ms", 100)  # default 100ms pulse
-                        trigger = props.get("trigger", "on_change")  # "on_press", "on_release", or "on_change"
-                        
-                        if tgt.startswith("button:"):
-                            btn_id = int(tgt.split(":", 1)[1])
-                            state_key = f"flightpanel.switch.{idx}"
-                            
-                            if mode == "toggle":
-                                # Toggle mode: pulse on state change
-                                prev_st = self._prev_state.get(state_key, None)
-                                
-                                # Trigger if state changed (or if this is the first time and state is True)
-                                if prev_st != st:
-                                    # State changed - check trigger condition
-                                    should_trigger = False
-                                    if trigger == "on_change":
-                                        should_trigger = True
-                                    elif trigger == "on_press" and st is True:
-                                        should_trigger = True
-                                    elif trigger == "on_release" and st is False:
-                                        should_trigger = True
-                                    
-                                    if should_trigger:
-                                        self._pulse_timers[btn_id] = time.time() + (pulse_ms / 1000.0)
-                                        LOG.debug("flightpanel.switch.%d changed %s->%s (trigger:%s), pulsing button:%d for %dms", 
-                                                 idx, prev_st, st, trigger, btn_id, pulse_ms)
-                                
-                                self._prev_state[state_key] = st
-                            else:
-                                # Direct mode: store state for later application
-                                self._prev_state[state_key] = st
-                        elif tgt.startswith("key:"):
-                            # Keyboard key support for flight panel switches
-                            key_names = self._key_names_from_target(tgt)
-                            state_key = f"flightpanel.switch.{idx}"
-                            
-                            if mode == "toggle":
-                                # Toggle mode: pulse on state change
-                                prev_st = self._prev_state.get(state_key, None)
-                                
-                                # Trigger if state changed (or if this is the first time and state is True)
-                                if prev_st != st:
-                                    # State changed - check trigger condition
-                                    should_trigger = False
-                                    if trigger == "on_change":
-                                        should_trigger = True
-                                    elif trigger == "on_press" and st is True:
-                                        should_trigger = True
-                                    elif trigger == "on_release" and st is False:
-                                        should_trigger = True
-                                    
-                                    if should_trigger:
-                                        for key_name in key_names:
-                                            self._pulse_timers[("key", key_name)] = time.time() + (pulse_ms / 1000.0)
-                                        LOG.debug("flightpanel.switch.%d changed %s->%s (trigger:%s), pulsing keys %s for %dms", 
-                                                 idx, prev_st, st, trigger, key_names, pulse_ms)
-                                
-                                self._prev_state[state_key] = st
-                            else:
-                                # Direct mode: store state for later application
-                                self._prev_state[state_key] = st
-                                for key_name in key_names:
-                                    self._prev_state[f"key:{key_name}"] = st
-                    if src.startswith("flightpanel.button") and device_name == "flightpanel":
-                        idx = int(src.split(".")[-1])
-                        st = bool(state.get("buttons", {}).get(idx, False))
-                        
-                        # Get mapping mode and pulse duration
-                        mode = props.get("mode", "direct")  # "direct" or "toggle"
-                        pulse_ms = props.get("pulse_ms", 100)  # default 100ms pulse
-                        trigger = props.get("trigger", "on_change")  # "on_press", "on_release", or "on_change"
-                        
-                        if tgt.startswith("button:"):
-                            btn_id = int(tgt.split(":", 1)[1])
-                            state_key = f"flightpanel.button.{idx}"
-                            
-                            if mode == "toggle":
-                                # Toggle mode: pulse on state change
-                                prev_st = self._prev_state.get(state_key, None)
-                                LOG.debug(f"flightpanel.button.{idx} toggle check: prev_st={prev_st}, st={st}, tgt={tgt}")
-                                
-                                # Trigger if state changed (or if this is the first time and state is True)
-                                if prev_st != st:
-                                    # State changed - check trigger condition
-                                    should_trigger = False
-                                    if trigger == "on_change":
-                                        should_trigger = True
-                                    elif trigger == "on_press" and st is True:
-                                        should_trigger = True
-                                    elif trigger == "on_release" and st is False:
-                                        should_trigger = True
-                                    
-                                    if should_trigger:
-                                        self._pulse_timers[btn_id] = time.time() + (pulse_ms / 1000.0)
-                                        LOG.debug("flightpanel.button.%d changed %s->%s (trigger:%s), pulsing button:%d for %dms", 
-                                                 idx, prev_st, st, trigger, btn_id, pulse_ms)
-                                
-                                self._prev_state[state_key] = st
-                            else:
-                                # Direct mode: store state for later application
-                                self._prev_state[state_key] = st
-                        elif tgt.startswith("key:"):
-                            # Keyboard key support for flight panel buttons
-                            key_names = self._key_names_from_target(tgt)
-                            state_key = f"flightpanel.button.{idx}"
-                            
-                            if mode == "toggle":
-                                # Toggle mode: pulse on state change
-                                prev_st = self._prev_state.get(state_key, None)
-                                
-                                # Trigger if state changed (or if this is the first time and state is True)
-                                if prev_st != st:
-                                    # State changed - check trigger condition
-                                    should_trigger = False
-                                    if trigger == "on_change":
-                                        should_trigger = True
-                                    elif trigger == "on_press" and st is True:
-                                        should_trigger = True
-                                    elif trigger == "on_release" and st is False:
-                                        should_trigger = True
-                                    
-                                    if should_trigger:
-                                        for key_name in key_names:
-                                            self._pulse_timers[("key", key_name)] = time.time() + (pulse_ms / 1000.0)
-                                        LOG.debug("flightpanel.button.%d changed %s->%s (trigger:%s), pulsing keys %s for %dms", 
-                                                 idx, prev_st, st, trigger, key_names, pulse_ms)
-                                
-                                self._prev_state[state_key] = st
-                            else:
-                                # Direct mode: store state for later application
-                                self._prev_state[state_key] = st
-                                for key_name in key_names:
-                                    self._prev_state[f"key:{key_name}"] = st
-                    if src.startswith("ch_throttle.axes") and device_name == "ch_throttle":
-                        idx = int(src.split(".")[-1])
-                        val = state.get("axes", {}).get(idx, 0.0)
-                        val = float(val)
-                        if props.get("invert"):
-                            val = -val
-                        val = val * float(props.get("scale", 1.0))
-                        # clamp
-                        val = max(-1.0, min(1.0, val))
-                        if tgt.startswith("axis:"):
-                            axis_name = tgt.split(":", 1)[1]
-                            cmd.axes[axis_name] = val
-                    if src.startswith("ch_throttle.button") and device_name == "ch_throttle":
-                        idx = int(src.split(".")[-1])
-                        st = bool(state.get("buttons", {}).get(idx, False))
-                        self._prev_state[src] = st
-                        if tgt.startswith("button:"):
-                            btn_id = int(tgt.split(":", 1)[1])
-                            cmd.buttons[btn_id] = st
-                        elif tgt.startswith("key:"):
-                            for key_name in self._key_names_from_target(tgt):
-                                cmd.keys[key_name] = st
-                        elif tgt.startswith("led:"):
-                            led_name = tgt.split(":", 1)[1]
-                            cmd.leds[led_name] = st
-                    if src.startswith("flightpanel.axis") and device_name == "flightpanel":
-                        idx = int(src.split(".")[-1])
-                        val = state.get("axes", {}).get(idx, 0.0)
-                        val = float(val)
-                        if props.get("invert"):
-                            val = -val
-                        val = val * float(props.get("scale", 1.0))
-                        # clamp
-                        val = max(-1.0, min(1.0, val))
-                        if tgt.startswith("axis:"):
-                            axis_name = tgt.split(":", 1)[1]
-                            cmd.axes[axis_name] = val
-                except Exception:
-                    LOG.exception("mapping error for binding %s", b)
-            
-            # Process multiple inputs (AND logic)
-            elif src_list and tgt:
-                try:
-                    mode = props.get("mode", "direct")
-                    logic = props.get("logic", "and")  # "and" or "all_same"
-                    pulse_ms = props.get("pulse_ms", 100)
-
-                    states = []
-                    for src_item in src_list:
-                        st, _ = self._refresh_state_from_event(src_item, device_name, state)
-                        states.append(st)
-
-                    if not states:
-                        continue
-
-                    if logic == "all_same":
-                        current_condition = all(states) or not any(states)
-                    else:
-                        current_condition = all(states)
-
-                    if tgt.startswith("button:"):
-                        btn_id = int(tgt.split(":", 1)[1])
-                        multi_state_key = f"multi:{tgt}"
-
-                        if mode == "toggle":
-                            prev_condition = self._prev_state.get(multi_state_key, False)
-                            if prev_condition != current_condition and current_condition:
-                                self._pulse_timers[btn_id] = time.time() + (pulse_ms / 1000.0)
-                                LOG.debug("multi-input %s toggle: button:%d pulsing for %dms (states=%s)", 
-                                         logic.upper(), btn_id, pulse_ms, states)
-                            self._prev_state[multi_state_key] = current_condition
-                        else:
-                            cmd.buttons[btn_id] = current_condition
-                            LOG.debug("multi-input %s direct: button:%d=%s (states=%s)", 
-                                     logic.upper(), btn_id, current_condition, states)
-
-                    if tgt.startswith("key:"):
-                        key_names = self._key_names_from_target(tgt)
-                        multi_state_key = f"multi:{tgt}"
-
-                        if mode == "toggle":
-                            prev_condition = self._prev_state.get(multi_state_key, False)
-                            if prev_condition != current_condition and current_condition:
-                                for key_name in key_names:
-                                    self._pulse_timers[("key", key_name)] = time.time() + (pulse_ms / 1000.0)
-                                LOG.debug("multi-input %s toggle: keys %s pulsing for %dms (states=%s)", 
-                                         logic.upper(), key_names, pulse_ms, states)
-                            self._prev_state[multi_state_key] = current_condition
-                        else:
-                            for key_name in key_names:
-                                cmd.keys[key_name] = current_condition
-                            LOG.debug("multi-input %s direct: keys %s=%s (states=%s)", 
-                                     logic.upper(), key_names, current_condition, states)
-                except Exception:
-                    LOG.exception("mapping error for multi-input binding %s", b)
-        
-        # Check active pulse timers and apply them to the command
-        # This runs on EVERY call, not just when flight panel events arrive
-        current_time = time.time()
-        expired_timers = []
-        for timer_id, end_time in self._pulse_timers.items():
-            if current_time < end_time:
-                # Handle both button pulses (int) and key pulses (tuple)
-                if isinstance(timer_id, tuple) and timer_id[0] == "key":
-                    cmd.keys[timer_id[1]] = True
-                else:
-                    cmd.buttons[timer_id] = True
+                toggle_state[multi_state_key] = current_condition
+                if current_condition:
+                    pulse_target(tgt_kind, tgt, now + pulse_s)
+                    if debug:
+                        LOG.debug("multi-input %s toggle: %s pulsing for %dms (states=%s)",
+                                  logic.upper(), target, pulse_ms, states)
+            elif tgt_kind == "button":
+                out_buttons[tgt] = current_condition
+                if debug:
+                    LOG.debug("multi-input %s direct: button:%d=%s (states=%s)",
+                              logic.upper(), tgt, current_condition, states)
             else:
-                expired_timers.append(timer_id)
-        
-        # Clean up expired timers
-        for timer_id in expired_timers:
-            del self._pulse_timers[timer_id]
-        
-        # Apply direct mode buttons from stored state (single and multiple inputs)
-        # These need to persist even when no flight panel event is sent
-        for b in bindings:
-            src = b.get("input")
-            src_list = b.get("inputs", [src] if src else [])
-            tgt = b.get("target")
-            props = b.get("props", {})
-            
-            if tgt and tgt.startswith("button:"):
-                mode = props.get("mode", "direct")
-                if mode == "direct":
-                    btn_id = int(tgt.split(":", 1)[1])
-                    
-                    # Single input direct mode
-                    if src and not b.get("inputs"):
-                        st, _ = self._refresh_state_from_event(src, device_name, state)
-                        cmd.buttons[btn_id] = st
-                    
-                    # Multiple inputs direct mode (AND logic or ALL_SAME logic)
-                    elif src_list:
-                        logic = props.get("logic", "and")  # "and" or "all_same"
-                        
-                        if logic == "all_same":
-                            # Fire when ALL inputs are true OR ALL inputs are false
-                            states = []
-                            for src_item in src_list:
-                                st, _ = self._refresh_state_from_event(src_item, device_name, state)
-                                states.append(st)
-                            
-                            # Check if all states are the same
-                            if states:
-                                all_true = all(states)
-                                all_false = not any(states)
-                                cmd.buttons[btn_id] = all_true or all_false
-                                LOG.debug("multi-input ALL_SAME condition for button:%d = %s (all_true=%s, all_false=%s)", 
-                                         btn_id, all_true or all_false, all_true, all_false)
-                            else:
-                                cmd.buttons[btn_id] = False
-                        else:
-                            # Default AND logic
-                            all_true = True
-                            for src_item in src_list:
-                                st, _ = self._refresh_state_from_event(src_item, device_name, state)
-                                if not st:
-                                    all_true = False
-                                    break
-                            cmd.buttons[btn_id] = all_true
-                            LOG.debug("multi-input AND condition for button:%d = %s", btn_id, all_true)
-            
-            # Handle keyboard keys in direct mode
-            elif tgt and tgt.startswith("key:"):
-                mode = props.get("mode", "direct")
-                if mode == "direct":
-                    key_names = self._key_names_from_target(tgt)
-                    
-                    # Single input direct mode
-                    if src and not b.get("inputs"):
-                        st, _ = self._refresh_state_from_event(src, device_name, state)
-                        for key_name in key_names:
-                            cmd.keys[key_name] = st
-                    
-                    # Multiple inputs direct mode (AND logic or ALL_SAME logic)
-                    elif src_list:
-                        logic = props.get("logic", "and")  # "and" or "all_same"
-                        
-                        if logic == "all_same":
-                            # Fire when ALL inputs are true OR ALL inputs are false
-                            states = []
-                            for src_item in src_list:
-                                st, _ = self._refresh_state_from_event(src_item, device_name, state)
-                                states.append(st)
-                            
-                            # Check if all states are the same
-                            if states:
-                                all_true = all(states)
-                                all_false = not any(states)
-                                for key_name in key_names:
-                                    cmd.keys[key_name] = all_true or all_false
-                                LOG.debug("multi-input ALL_SAME condition for keys %s = %s (all_true=%s, all_false=%s)", 
-                                         key_names, all_true or all_false, all_true, all_false)
-                            else:
-                                for key_name in key_names:
-                                    cmd.keys[key_name] = False
-                        else:
-                            # Default AND logic
-                            all_true = True
-                            for src_item in src_list:
-                                st, _ = self._refresh_state_from_event(src_item, device_name, state)
-                                if not st:
-                                    all_true = False
-                                    break
-                            for key_name in key_names:
-                                cmd.keys[key_name] = all_true
-                            LOG.debug("multi-input AND condition for keys %s = %s", key_names, all_true)
-        
-        # Handle LED outputs
-        for b in bindings:
-            src = b.get("input")
-            src_list = b.get("inputs", [src] if src else [])
-            tgt = b.get("target")
-            props = b.get("props", {})
-            
-            if tgt and tgt.startswith("led:"):
-                led_name = tgt.split(":", 1)[1]
-                mode = props.get("mode", "direct")
-                
-                # Single input direct mode
-                if src and not b.get("inputs"):
-                    st, _ = self._refresh_state_from_event(src, device_name, state)
-                    cmd.leds[led_name] = st
-                
-                # Multiple inputs direct mode (AND logic or ALL_SAME logic)
-                elif src_list:
-                    logic = props.get("logic", "and")
-                    
-                    if logic == "all_same":
-                        states = []
-                        for src_item in src_list:
-                            st, _ = self._refresh_state_from_event(src_item, device_name, state)
-                            states.append(st)
-                        
-                        if states:
-                            all_true = all(states)
-                            all_false = not any(states)
-                            cmd.leds[led_name] = all_true or all_false
-                            LOG.debug("multi-input ALL_SAME condition for led:%s = %s", led_name, all_true or all_false)
-                        else:
-                            cmd.leds[led_name] = False
-                    else:
-                        # Default AND logic
-                        all_true = True
-                        for src_item in src_list:
-                            st, _ = self._refresh_state_from_event(src_item, device_name, state)
-                            if not st:
-                                all_true = False
-                                break
-                        cmd.leds[led_name] = all_true
-                        LOG.debug("multi-input AND condition for led:%s = %s", led_name, all_true)
-        
-        LOG.debug("mapped state -> %s", cmd)
-        return cmd
+                for key_name in tgt:
+                    out_keys[key_name] = current_condition
+                if debug:
+                    LOG.debug("multi-input %s direct: keys %s=%s (states=%s)",
+                              logic.upper(), list(tgt), current_condition, states)
+
+    def _apply_pulses_and_direct(self, cmd: VJoyCommand, now: float):
+        """Apply active pulses and the cached direct outputs to `cmd`.
+
+        This runs on EVERY tick, not just when flight panel events arrive.
+        """
+        # Expire due pulses, then apply the ones still active to the command
+        heap = self._pulse_heap
+        while heap and heap[0][0] <= now:
+            end_time, _, pulses, timer_id = heapq.heappop(heap)
+            if pulses.get(timer_id) == end_time:
+                del pulses[timer_id]
+        for button_id in self._button_pulses:
+            cmd.buttons[button_id] = True
+        for key_name in self._key_pulses:
+            cmd.keys[key_name] = True
+
+        # Apply direct mode buttons/keys and LEDs (single and multiple inputs). These
+        # persist even when no flight panel event is sent, so every call re-asserts
+        # the cached outputs; only bindings whose inputs just changed are re-evaluated.
+        direct = self._direct_bindings
+        bits = self._state_bits
+        dirty = self._dirty_direct
+        debug = dirty and LOG.isEnabledFor(logging.DEBUG)
+        for i in dirty:
+            tgt_kind, tgt, sources, mask, logic, outputs = direct[i]
+            current = _direct_condition(bits, mask, logic)
+            for out, name in outputs:
+                out[name] = current
+            if debug and logic is not None:
+                LOG.debug("multi-input %s condition for %s:%s = %s", logic.upper(), tgt_kind, tgt, current)
+        cmd.buttons.update(self._direct_buttons)
+        cmd.keys.update(self._direct_keys)
+        cmd.leds.update(self._direct_leds)
+        dirty.clear()
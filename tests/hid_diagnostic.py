@@ -9,6 +9,9 @@ import hid
 import struct
 import time
 
+# Four little-endian signed 16-bit values at the start of a report
+_S4H = struct.Struct('<hhhh')
+
 def list_devices():
     """List all HID devices."""
     print("=" * 60)
@@ -68,13 +71,14 @@ def inspect_x55():
                 if data:
                     count += 1
                     # Print as hex and attempt some structure
-                    hex_str = " ".join(f"{b:02X}" for b in data)
+                    hex_str = bytes(data).hex(" ").upper()
                     print(f"Report {count}: {hex_str}")
                     
                     # Try to parse as signed 16-bit values
                     try:
-                        if len(data) >= 8:
-                            vals = struct.unpack_from('<hhhh', data, 0)
+                        if len(data) >= _S4H.size:
+                            # hidapi returns a list of ints; struct needs a buffer
+                            vals = _S4H.unpack_from(bytes(data), 0)
                             print(f"  → As s16[4]: {vals}")
                     except:
                         pass
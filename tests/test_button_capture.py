@@ -41,6 +41,10 @@ def main():
     
     baseline_report = None
     report_count = 0
+    # Reports are copied into one reusable buffer and compared through a view,
+    # so an unchanged report costs no allocation
+    buf = bytearray(64)
+    view = memoryview(buf)
     
     try:
         while True:
@@ -48,19 +52,22 @@ def main():
             
             if data:
                 report_count += 1
+                n = len(data)
+                buf[:n] = data
+                report = view[:n]
                 
                 if baseline_report is None:
-                    baseline_report = bytes(data)
-                    print(f"[{report_count}] Baseline: {' '.join(f'{b:02X}' for b in data)}")
+                    baseline_report = report.tobytes()
+                    print(f"[{report_count}] Baseline: {baseline_report.hex(' ').upper()}")
                     continue
                 
                 # Check if this report is different from baseline
-                if bytes(data) != baseline_report:
-                    diff_indices = [i for i in range(len(data)) if data[i] != baseline_report[i]]
+                if report != baseline_report:
+                    diff_indices = [i for i, (new, old) in enumerate(zip(report, baseline_report)) if new != old]
                     print(f"[{report_count}] DIFFERENT! Changed bytes: {diff_indices}")
-                    print(f"       New: {' '.join(f'{b:02X}' for b in data)}")
-                    print(f"       Old: {' '.join(f'{b:02X}' for b in baseline_report)}")
-                    print(f"       Diffs: {' '.join(f'[{i}]:{baseline_report[i]:02X}→{data[i]:02X}' for i in diff_indices)}")
+                    print(f"       New: {report.hex(' ').upper()}")
+                    print(f"       Old: {baseline_report.hex(' ').upper()}")
+                    print(f"       Diffs: {' '.join(f'[{i}]:{baseline_report[i]:02X}→{report[i]:02X}' for i in diff_indices)}")
                     print()
                 
                 time.sleep(0.05)  # 50ms between checks
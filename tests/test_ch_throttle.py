@@ -0,0 +1,47 @@
+import copy
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from devices.ch_throttle import CHThrottleReader
+
+
+def _capture(reader):
+    # The reader emits one live dict, so snapshot each emission
+    states = []
+    reader.subscribe(lambda state: states.append(copy.deepcopy(state)))
+    return states
+
+
+def test_events_emit_only_on_change():
+    reader = CHThrottleReader()
+    states = _capture(reader)
+    press = pygame.event.Event(pygame.JOYBUTTONDOWN, button=1)
+    move = pygame.event.Event(pygame.JOYAXISMOTION, axis=0, value=0.5)
+
+    reader._on_events([press, move])
+    reader._on_events([press, move])
+
+    assert len(states) == 1
+    assert states[0]["buttons"][1] == 1
+    assert states[0]["axes"][0] == -0.5
+
+
+class _BrokenJoystick:
+    """Name-matched device that fails as soon as it is read"""
+
+    def get_axis(self, i):
+        raise pygame.error("Invalid joystick axis")
+
+
+def test_start_survives_failed_attach(monkeypatch):
+    reader = CHThrottleReader()
+    monkeypatch.setattr(reader, "_find_ch_throttle", lambda: _BrokenJoystick())
+
+    reader.start()
+    try:
+        assert reader._joystick is None
+        assert reader._t.is_alive()
+    finally:
+        reader.stop()
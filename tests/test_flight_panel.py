@@ -0,0 +1,58 @@
+import copy
+
+from devices.flight_panel import FlightPanelReader
+
+
+def _capture(reader):
+    # The reader emits one live dict, so snapshot each emission
+    states = []
+    reader.subscribe(lambda state: states.append(copy.deepcopy(state)))
+    return states
+
+
+def test_parse_maps_bits_to_switch_indices():
+    reader = FlightPanelReader()
+    states = _capture(reader)
+
+    reader._parse_and_emit([0x05, 0x80, 0x0a])
+
+    buttons = states[-1]["buttons"]
+    assert buttons[0] and buttons[2]
+    assert buttons[15]
+    assert buttons[17] and buttons[19]
+    assert not buttons[1] and not buttons[18]
+
+
+def test_parse_emits_only_on_change():
+    reader = FlightPanelReader()
+    states = _capture(reader)
+
+    reader._parse_and_emit([0x01, 0x00, 0x00])
+    reader._parse_and_emit([0x01, 0x00, 0x00])
+    reader._parse_and_emit([0x03, 0x00, 0x00])
+
+    assert len(states) == 2
+    assert not states[0]["buttons"][1]
+    assert states[1]["buttons"][1]
+
+
+def test_parse_skips_report_id_byte():
+    reader = FlightPanelReader()
+    states = _capture(reader)
+
+    reader._parse_and_emit([0x00, 0x02, 0x00, 0x00], payload_start=1)
+
+    assert states[-1]["buttons"][1]
+    assert not states[-1]["buttons"][0]
+
+
+def test_baseline_and_parsed_states_store_int_buttons():
+    reader = FlightPanelReader()
+    states = _capture(reader)
+
+    reader._emit_baseline_state()
+    reader._parse_and_emit([0x01, 0x00, 0x00])
+
+    assert all(type(v) is int for state in states for v in state["buttons"].values())
+    assert states[0]["buttons"][0] == 0
+    assert states[1]["buttons"][0] == 1
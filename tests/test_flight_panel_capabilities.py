@@ -24,6 +24,9 @@ except ImportError:
 LOGITECH_VID = 0x06a3
 FLIGHT_PANEL_PID = 0x0d67
 
+# "0 1 1 0 1 0 0 1" rendering of every byte value, for the bit dump
+_BITS = [' '.join(format(i, '08b')) for i in range(256)]
+
 
 def test_device_discovery():
     """Find the Flight Panel and list all HID devices."""
@@ -65,7 +68,7 @@ def test_feature_report(device):
         data = device.get_feature_report(0, 64)
         LOG.info("✓ get_feature_report(0, 64) succeeded")
         LOG.info("  Data length: %d bytes", len(data))
-        LOG.info("  Raw data: %s", ' '.join(f"{b:02x}" for b in data))
+        LOG.info("  Raw data: %s", bytes(data).hex(' '))
         return True
     except Exception as e:
         LOG.warning("✗ get_feature_report(0) failed: %s", e)
@@ -75,7 +78,7 @@ def test_feature_report(device):
         data = device.get_feature_report(1, 64)
         LOG.info("✓ get_feature_report(1, 64) succeeded")
         LOG.info("  Data length: %d bytes", len(data))
-        LOG.info("  Raw data: %s", ' '.join(f"{b:02x}" for b in data))
+        LOG.info("  Raw data: %s", bytes(data).hex(' '))
         return True
     except Exception as e:
         LOG.warning("✗ get_feature_report(1) failed: %s", e)
@@ -94,21 +97,23 @@ def test_input_reports(device, duration=5, timeout_ms=100):
     start = time.time()
     report_count = 0
     last_data = None
+    # Level checked once; the per-report dump below is ~70 log calls
+    dump = LOG.isEnabledFor(logging.INFO)
     
     while time.time() - start < duration:
         try:
             data = device.read(64, timeout_ms=timeout_ms)
             if data:
                 report_count += 1
-                LOG.info("Report #%d:", report_count)
-                LOG.info("  Length: %d bytes", len(data))
-                LOG.info("  Raw: %s", ' '.join(f"{b:02x}" for b in data))
-                
-                # Try to decode as bit flags
-                LOG.info("  Bytes as bits:")
-                for byte_idx, byte_val in enumerate(data):
-                    bits = ' '.join(str((byte_val >> (7 - i)) & 1) for i in range(8))
-                    LOG.info("    Byte %d (0x%02x): %s", byte_idx, byte_val, bits)
+                if dump:
+                    LOG.info("Report #%d:", report_count)
+                    LOG.info("  Length: %d bytes", len(data))
+                    LOG.info("  Raw: %s", bytes(data).hex(' '))
+                    
+                    # Try to decode as bit flags
+                    LOG.info("  Bytes as bits:")
+                    for byte_idx, byte_val in enumerate(data):
+                        LOG.info("    Byte %d (0x%02x): %s", byte_idx, byte_val, _BITS[byte_val])
                 
                 if last_data and last_data != data:
                     LOG.info("  ⚠ CHANGED from previous report")
@@ -135,7 +140,7 @@ def test_nonblocking_read(device):
         data = device.read(64, timeout_ms=1)
         if data:
             LOG.info("✓ Immediate read succeeded (device had pending data)")
-            LOG.info("  Data: %s", ' '.join(f"{b:02x}" for b in data))
+            LOG.info("  Data: %s", bytes(data).hex(' '))
         else:
             LOG.info("✓ Read timeout with no pending data (expected if no switch changed)")
     except Exception as e:
@@ -44,7 +44,7 @@ def test_led_control():
     # First, let's read the current feature report again
     try:
         data = device.get_feature_report(0, 64)
-        LOG.info("Current feature report (report ID 0): %s", ' '.join(f"{b:02x}" for b in data))
+        LOG.info("Current feature report (report ID 0): %s", bytes(data).hex(' '))
     except Exception as e:
         LOG.warning("get_feature_report(0) failed: %s", e)
     
@@ -52,7 +52,7 @@ def test_led_control():
     for report_id in [1, 2, 3, 4, 5]:
         try:
             data = device.get_feature_report(report_id, 64)
-            LOG.info("Feature report ID %d: %s", report_id, ' '.join(f"{b:02x}" for b in data))
+            LOG.info("Feature report ID %d: %s", report_id, bytes(data).hex(' '))
         except Exception as e:
             LOG.debug("Feature report ID %d not available: %s", report_id, e)
     
@@ -72,14 +72,14 @@ def test_led_control():
     
     for report_id, data in test_reports:
         try:
-            LOG.info("Attempting to set feature report ID %d: %s", report_id, ' '.join(f"{b:02x}" for b in data))
+            LOG.info("Attempting to set feature report ID %d: %s", report_id, bytes(data).hex(' '))
             result = device.send_feature_report(data)
             LOG.info("  ✓ Success! Result: %d", result)
             
             # Read back to see if it changed
             try:
                 read_back = device.get_feature_report(report_id, 64)
-                LOG.info("  Read back: %s", ' '.join(f"{b:02x}" for b in read_back))
+                LOG.info("  Read back: %s", bytes(read_back).hex(' '))
             except Exception as e:
                 LOG.debug("  Could not read back: %s", e)
             
@@ -97,7 +97,7 @@ def test_led_control():
     
     for data in test_writes:
         try:
-            LOG.info("Attempting to write: %s", ' '.join(f"{b:02x}" for b in data))
+            LOG.info("Attempting to write: %s", bytes(data).hex(' '))
             result = device.write(data)
             LOG.info("  ✓ Success! Result: %d", result)
             time.sleep(0.5)
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+pytest.importorskip("hid")
+
+from devices import flight_panel_leds
+from devices.flight_panel_leds import FlightPanelLEDControl
+
+
+class _FlakyDevice:
+    """Fake HID handle whose first feature report send fails"""
+
+    def __init__(self):
+        self.sent = []
+        self.fail_next = True
+        self.attempted = threading.Event()
+        self.delivered = threading.Event()
+
+    def open_path(self, path):
+        pass
+
+    def get_feature_report(self, report_id, length):
+        return [0x00, 0x00, 0x00, 0x00]
+
+    def send_feature_report(self, data):
+        if self.fail_next:
+            self.fail_next = False
+            self.attempted.set()
+            raise OSError("transfer failed")
+        self.sent.append(bytes(data))
+        self.delivered.set()
+
+    def close(self):
+        pass
+
+
+def test_set_lights_retries_after_failed_send(monkeypatch):
+    device = _FlakyDevice()
+    monkeypatch.setattr(flight_panel_leds.hid, "enumerate", lambda vid, pid: [{"path": b"fake"}])
+    monkeypatch.setattr(flight_panel_leds.hid, "device", lambda: device)
+    leds = FlightPanelLEDControl()
+    assert leds.connect()
+    try:
+        leds.set_lights(n=True)
+        assert device.attempted.wait(2)
+
+        leds.set_lights(n=True)
+
+        assert device.delivered.wait(2)
+        assert device.sent[-1][1] & flight_panel_leds.N_LIGHT_BIT
+    finally:
+        leds.disconnect()
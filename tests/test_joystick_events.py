@@ -0,0 +1,32 @@
+import os
+import threading
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from devices.joystick_events import JoystickEventPump, init_joystick_subsystem
+
+INSTANCE_ID = 4242
+
+
+def test_register_right_after_last_unregister_keeps_pumping():
+    init_joystick_subsystem()
+    pump = JoystickEventPump()
+    pump.register(INSTANCE_ID, lambda events: None)
+    old_thread = pump._t
+
+    # Re-register while the old pump thread may still be inside event.wait()
+    pump.unregister(INSTANCE_ID)
+    received = threading.Event()
+    pump.register(INSTANCE_ID, lambda events: received.set())
+
+    pygame.event.post(pygame.event.Event(pygame.JOYBUTTONDOWN, instance_id=INSTANCE_ID, joy=0, button=0))
+    assert received.wait(2.0)
+    assert pump._t is not None and pump._t.is_alive()
+
+    pump.unregister(INSTANCE_ID)
+    old_thread.join(timeout=2.0)
+    if pump._t is not None:
+        pump._t.join(timeout=2.0)
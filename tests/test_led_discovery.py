@@ -19,7 +19,7 @@ print("\n" + "=" * 60 + "\n")
 
 # Read baseline
 baseline = device.get_feature_report(0, 64)
-print(f"Baseline state: {' '.join(f'{b:02x}' for b in baseline[:4])}")
+print(f"Baseline state: {bytes(baseline[:4]).hex(' ')}")
 print(f"  Byte 1: 0x{baseline[1]:02x} = {baseline[1]:08b}")
 print(f"  Byte 2: 0x{baseline[2]:02x} = {baseline[2]:08b}")
 print(f"  Byte 3: 0x{baseline[3]:02x} = {baseline[3]:08b}")
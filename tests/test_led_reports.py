@@ -13,7 +13,7 @@ print("All available feature reports:\n")
 for report_id in range(6):
     try:
         data = device.get_feature_report(report_id, 64)
-        print(f'Report ID {report_id}: {" ".join(f"{b:02x}" for b in data[:8])}')
+        print(f'Report ID {report_id}: {bytes(data[:8]).hex(" ")}')
     except Exception as e:
         print(f'Report ID {report_id}: Not available - {e}')
 
@@ -22,7 +22,7 @@ print("\n\nTrying to write to report ID 1 (output report)...\n")
 # Try to modify and write to report ID 1
 try:
     current = device.get_feature_report(1, 64)
-    print(f'Current report ID 1: {" ".join(f"{b:02x}" for b in current)}')
+    print(f'Current report ID 1: {bytes(current).hex(" ")}')
     
     # Try setting various bytes
     for byte_idx in range(1, min(4, len(current))):
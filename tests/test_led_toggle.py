@@ -14,13 +14,13 @@ device.open_path(devices[0]['path'])
 
 # Read current
 current = device.get_feature_report(0, 64)
-print(f'Current state: {" ".join(f"{b:02x}" for b in current)}')
+print(f'Current state: {bytes(current).hex(" ")}')
 print(f'Byte 1 (landing gear LED): 0x{current[1]:02x} = {bin(current[1])}')
 
 # Turn OFF landing gear LED (clear bit 7 of byte 1)
 modified = bytearray(current)
 modified[1] = modified[1] & 0x7F  # Clear bit 7
-print(f'Modified (LED OFF): {" ".join(f"{b:02x}" for b in modified)}')
+print(f'Modified (LED OFF): {bytes(modified).hex(" ")}')
 
 result = device.send_feature_report(modified)
 print(f'Send result: {result}')
@@ -28,19 +28,19 @@ print(f'Send result: {result}')
 # Read back
 time.sleep(0.5)
 new_state = device.get_feature_report(0, 64)
-print(f'New state:     {" ".join(f"{b:02x}" for b in new_state)}')
+print(f'New state:     {bytes(new_state).hex(" ")}')
 print(f'LED changed: {new_state[1] != current[1]}')
 
 # Now turn it back ON
 print('\nTurning LED back ON...')
 modified[1] = modified[1] | 0x80  # Set bit 7
-print(f'Modified (LED ON): {" ".join(f"{b:02x}" for b in modified)}')
+print(f'Modified (LED ON): {bytes(modified).hex(" ")}')
 
 result = device.send_feature_report(modified)
 print(f'Send result: {result}')
 
 time.sleep(0.5)
 new_state = device.get_feature_report(0, 64)
-print(f'New state:     {" ".join(f"{b:02x}" for b in new_state)}')
+print(f'New state:     {bytes(new_state).hex(" ")}')
 
 device.close()
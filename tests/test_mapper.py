@@ -15,3 +15,246 @@ def test_axis_invert_and_scale(tmp_path):
 
     assert pytest.approx(cmd.axes["AXIS_X"], rel=1e-3) == -0.5
     assert cmd.buttons[1] is True
+
+
+def test_full_mapping_combines_devices():
+    profile = {
+        "bindings": [
+            {"input": "x55.axes.0", "target": "axis:AXIS_X"},
+            {"input": "ch_throttle.axes.0", "target": "axis:AXIS_Z"},
+            {"input": "ch_throttle.button.2", "target": "button:3"},
+        ]
+    }
+    m = Mapper(profile)
+    cmd = m.map_state_to_vjoy_full({
+        "x55": {"axes": {0: 0.25}, "buttons": {}},
+        "ch_throttle": {"axes": {0: -0.5}, "buttons": {2: True}},
+    })
+
+    assert cmd.axes == {"AXIS_X": 0.25, "AXIS_Z": -0.5}
+    assert cmd.buttons[3] is True
+
+
+def test_button_key_and_hat_targets():
+    profile = {
+        "bindings": [
+            {"input": "x55.button.1", "target": "key:shift key:c"},
+            {"input": "x55.hat.0", "target": "pov:1"},
+            {"input": "ch_throttle.button.0", "target": "led:n_light"},
+        ]
+    }
+    m = Mapper(profile)
+    cmd = m.map_state_to_vjoy({"device": "x55", "buttons": {1: True}, "hats": {0: (1, 0)}})
+    assert cmd.keys == {"shift": True, "c": True}
+    assert cmd.povs == {1: 90}
+
+    cmd = m.map_state_to_vjoy({"device": "x55", "buttons": {1: False}, "hats": {0: (0, 0)}})
+    assert cmd.keys == {"shift": False, "c": False}
+    assert cmd.povs == {1: -1}
+
+    cmd = m.map_state_to_vjoy({"device": "ch_throttle", "buttons": {0: True}})
+    assert cmd.leds == {"n_light": True}
+
+
+def test_direct_button_persists_across_device_events():
+    profile = {"bindings": [{"input": "x55.button.0", "target": "button:1"}]}
+    m = Mapper(profile)
+    m.map_state_to_vjoy({"device": "x55", "buttons": {0: True}})
+
+    cmd = m.map_state_to_vjoy({"device": "ch_throttle", "axes": {0: 0.0}, "buttons": {}})
+    assert cmd.buttons == {1: True}
+
+
+def test_toggle_switch_pulses_on_change():
+    profile = {
+        "bindings": [
+            {"input": "flightpanel.switch.0", "target": "button:5",
+             "props": {"mode": "toggle", "pulse_ms": 10000}},
+            {"input": "flightpanel.switch.1", "target": "key:g",
+             "props": {"mode": "toggle", "pulse_ms": 10000, "trigger": "on_press"}},
+        ]
+    }
+    m = Mapper(profile)
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: True, 1: False}})
+    assert cmd.buttons == {5: True}
+    assert cmd.keys == {}
+    assert m.has_pending_pulses()
+
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: True, 1: True}})
+    assert cmd.buttons == {5: True}
+    assert cmd.keys == {"g": True}
+
+
+def test_bindings_sharing_a_switch_only_act_on_its_changes(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("mapper.time.monotonic", lambda: clock[0])
+    profile = {
+        "bindings": [
+            {"input": "flightpanel.switch.0", "target": "button:5",
+             "props": {"mode": "toggle", "pulse_ms": 50}},
+            {"input": "flightpanel.switch.0", "target": "key:a"},
+        ]
+    }
+    m = Mapper(profile)
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: True, 1: False}})
+    assert cmd.buttons == {5: True}
+    assert cmd.keys == {"a": True}
+
+    # Another switch moving leaves switch 0's shared state alone: no new pulse
+    clock[0] = 1.0
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: True, 1: True}})
+    assert cmd.buttons == {}
+    assert cmd.keys == {"a": True}
+
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: False, 1: True}})
+    assert cmd.buttons == {5: True}
+    assert cmd.keys == {"a": False}
+
+
+def test_expired_pulse_is_released():
+    profile = {
+        "bindings": [
+            {"input": "flightpanel.button.3", "target": "button:2",
+             "props": {"mode": "toggle", "pulse_ms": 0}},
+        ]
+    }
+    m = Mapper(profile)
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {3: True}})
+    assert 2 not in cmd.buttons
+    assert not m.has_pending_pulses()
+
+
+def test_multi_input_logic():
+    profile = {
+        "bindings": [
+            {"inputs": ["flightpanel.switch.0", "x55.button.0"], "target": "button:1"},
+            {"inputs": ["flightpanel.switch.0", "flightpanel.switch.1"], "target": "button:2",
+             "props": {"logic": "all_same"}},
+            {"inputs": ["flightpanel.switch.0", "flightpanel.switch.1"], "target": "led:landing_gear"},
+        ]
+    }
+    m = Mapper(profile)
+    cmd = m.map_state_to_vjoy_full({
+        "flightpanel": {"buttons": {0: True, 1: False}},
+        "x55": {"axes": {}, "buttons": {0: True}},
+    })
+    assert cmd.buttons == {1: True, 2: False}
+    assert cmd.leds == {"landing_gear": False}
+
+    cmd = m.map_state_to_vjoy_full({
+        "flightpanel": {"buttons": {0: False, 1: False}},
+        "x55": {"axes": {}, "buttons": {0: True}},
+    })
+    assert cmd.buttons == {1: False, 2: True}
+    assert cmd.leds == {"landing_gear": False}
+
+
+def test_multi_input_toggle_pulses_on_rising_condition():
+    profile = {
+        "bindings": [
+            {"inputs": ["flightpanel.switch.0", "flightpanel.switch.1"], "target": "button:9",
+             "props": {"mode": "toggle", "pulse_ms": 10000}},
+        ]
+    }
+    m = Mapper(profile)
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: True, 1: False}})
+    assert cmd.buttons == {}
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: True, 1: True}})
+    assert cmd.buttons == {9: True}
+
+
+def test_multi_input_toggle_waits_for_its_own_device_at_startup():
+    profile = {
+        "bindings": [
+            {"inputs": ["flightpanel.switch.0", "flightpanel.switch.1"], "target": "button:32",
+             "props": {"mode": "toggle", "logic": "all_same", "pulse_ms": 10000}},
+        ]
+    }
+    m = Mapper(profile)
+    # Another device reporting first does not evaluate the binding
+    cmd = m.map_state_to_vjoy({"device": "x55", "buttons": {0: True}})
+    assert cmd.buttons == {}
+    assert not m.has_pending_pulses()
+
+    # The first flight panel report does: all inputs released satisfies all_same
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: False, 1: False}})
+    assert cmd.buttons == {32: True}
+
+
+def test_multi_input_toggles_on_one_target_fire_independently(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("mapper.time.monotonic", lambda: clock[0])
+    profile = {
+        "bindings": [
+            {"inputs": ["x55.button.0", "flightpanel.switch.0"], "target": "key:k",
+             "props": {"mode": "toggle", "pulse_ms": 50}},
+            {"inputs": ["x55.button.1", "flightpanel.switch.0"], "target": "key:k",
+             "props": {"mode": "toggle", "pulse_ms": 50}},
+        ]
+    }
+    m = Mapper(profile)
+    m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: True}})
+    cmd = m.map_state_to_vjoy({"device": "x55", "buttons": {0: True, 1: False}})
+    assert cmd.keys == {"k": True}
+
+    # With the first condition still held, the second binding's rising edge pulses too
+    clock[0] = 1.0
+    cmd = m.map_state_to_vjoy({"device": "x55", "buttons": {0: True, 1: False}})
+    assert cmd.keys == {}
+    cmd = m.map_state_to_vjoy({"device": "x55", "buttons": {0: True, 1: True}})
+    assert cmd.keys == {"k": True}
+
+
+def test_load_profile_from_yaml(tmp_path):
+    path = tmp_path / "profile.yaml"
+    path.write_text(
+        "bindings:\n"
+        "  - input: x55.button.0\n"
+        "    target: button:4\n",
+        encoding="utf-8",
+    )
+    m = Mapper.load_profile(str(path))
+    cmd = m.map_state_to_vjoy({"device": "x55", "buttons": {0: True}})
+    assert cmd.buttons == {4: True}
+
+
+def test_load_profile_rereads_edited_file(tmp_path):
+    path = tmp_path / "profile.yaml"
+    path.write_text("bindings:\n  - input: x55.button.0\n    target: button:4\n", encoding="utf-8")
+    first = Mapper.load_profile(str(path))
+    first.profile["bindings"].clear()
+    assert Mapper.load_profile(str(path)).profile["bindings"] == [{"input": "x55.button.0", "target": "button:4"}]
+
+    path.write_text("bindings:\n  - input: x55.button.0\n    target: button:12\n", encoding="utf-8")
+    cmd = Mapper.load_profile(str(path)).map_state_to_vjoy({"device": "x55", "buttons": {0: True}})
+    assert cmd.buttons == {12: True}
+
+
+def test_last_direct_binding_for_a_target_wins():
+    profile = {
+        "bindings": [
+            {"input": "x55.button.0", "target": "button:1"},
+            {"input": "flightpanel.switch.0", "target": "button:1"},
+        ]
+    }
+    m = Mapper(profile)
+    cmd = m.map_state_to_vjoy({"device": "x55", "buttons": {0: True}})
+    assert cmd.buttons == {1: False}
+
+    cmd = m.map_state_to_vjoy({"device": "flightpanel", "buttons": {0: True}})
+    assert cmd.buttons == {1: True}
+
+
+def test_unknown_input_warns_once_at_load(caplog):
+    profile = {"bindings": [{"input": "pedals.axes.0", "target": "axis:AXIS_Z"}]}
+    with caplog.at_level("WARNING", logger="flightbridge.mapper"):
+        m = Mapper(profile)
+        m.map_state_to_vjoy({"device": "pedals", "axes": {0: 1.0}})
+        m.map_state_to_vjoy({"device": "pedals", "axes": {0: 1.0}})
+    assert len([r for r in caplog.records if "pedals.axes.0" in r.getMessage()]) == 1
+
+
+def test_malformed_binding_fails_at_load():
+    profile = {"bindings": [{"input": "x55.axes.0", "target": "axis:AXIS_X", "props": {"scale": "half"}}]}
+    with pytest.raises(ValueError, match="#0"):
+        Mapper(profile)
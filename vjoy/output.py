@@ -107,6 +107,12 @@ class VJoyOutput:
         self._t = None
         self._stop = threading.Event()
         self._positions = {did: JOYSTICK_POSITION() for did in device_ids}
+        # vJoy button id -> (device id, bit in lButtons): 1-32 → device 1, 33-64 → device 2, etc.
+        self._button_slots = {
+            index * 32 + bit + 1: (did, 1 << bit)
+            for index, did in enumerate(device_ids)
+            for bit in range(32)
+        }
         
         # Initialize keyboard controller and track key states
         if KEYBOARD_AVAILABLE:
@@ -120,6 +126,8 @@ class VJoyOutput:
         for did in device_ids:
             self._positions[did].bDevice = did
         self._acquired = {did: False for did in device_ids}
+        # Devices that have had at least one full UpdateVJD; afterwards only changes are sent
+        self._synced = set()
 
         if VJOY_AVAILABLE:
             for did in device_ids:
@@ -298,15 +306,19 @@ class VJoyOutput:
         # Handle LED commands if controller is available
         if self.led_controller and cmd.leds:
             try:
+                # Collect the lights first so they go out in a single feature report
+                n = l = None
                 for led_name, state in cmd.leds.items():
                     if led_name == "n_light":
-                        self.led_controller.set_n_light(state)
+                        n = state
                     elif led_name == "l_light":
-                        self.led_controller.set_l_light(state)
+                        l = state
                     elif led_name == "landing_gear":
-                        self.led_controller.set_landing_gear(state)
+                        n = l = state
                     else:
                         LOG.debug("unknown led: %s", led_name)
+                if n is not None or l is not None:
+                    self.led_controller.set_lights(n=n, l=l)
             except Exception:
                 LOG.exception("failed to send LED command")
         
@@ -319,13 +331,17 @@ class VJoyOutput:
             # Apply axes to device 1 only (all axes go to primary device)
             device_id = self.device_ids[0]
             pos = self._positions[device_id]
+            # Devices whose position differs from what vJoy last received
+            dirty = {did for did in self.device_ids if did not in self._synced}
             
             # Set axes
             for name, v in cmd.axes.items():
                 field_name = AXIS_MAP.get(name)
                 if field_name:
                     iv = self._to_vjoy_axis(v)
-                    setattr(pos, field_name, iv)
+                    if getattr(pos, field_name) != iv:
+                        setattr(pos, field_name, iv)
+                        dirty.add(device_id)
                     LOG.debug("set axis %s -> %d", name, iv)
                 else:
                     LOG.debug("unknown vjoy axis %s", name)
@@ -335,38 +351,45 @@ class VJoyOutput:
                 for pid, deg in cmd.povs.items():
                     if pid == 0:
                         if deg == -1:
-                            pos.bHats = 0xFFFF  # centered
+                            hat_val = 0xFFFF  # centered
                         else:
                             # Convert 0-360 degrees to DirectInput format (hundredths of degrees, 0-35999)
                             # Normalize to 0-360 range
                             deg_normalized = deg % 360
                             # Convert to hundredths of degrees
                             hat_val = int(deg_normalized * 100)
+                        if pos.bHats != hat_val:
                             pos.bHats = hat_val
+                            dirty.add(device_id)
                         LOG.debug("set pov %d -> 0x%x (degrees: %s)", pid, pos.bHats, deg)
 
-            # Distribute buttons across devices: 1-32 → device 1, 33-64 → device 2, etc.
-            device_buttons = {did: 0 for did in self.device_ids}
+            # Distribute buttons across devices via the precomputed slot table;
+            # ids beyond the configured devices are dropped
+            device_buttons = dict.fromkeys(self.device_ids, 0)
+            button_slots = self._button_slots
             for bid, state in cmd.buttons.items():
                 if state:
-                    # Calculate which device this button belongs to
-                    device_index = (bid - 1) // 32
-                    if device_index < len(self.device_ids):
-                        device_id = self.device_ids[device_index]
-                        # Calculate button position within that device (0-31)
-                        button_bit = (bid - 1) % 32
-                        device_buttons[device_id] |= (1 << button_bit)
+                    slot = button_slots.get(bid)
+                    if slot is not None:
+                        device_buttons[slot[0]] |= slot[1]
 
-            # Apply button states to each device
+            # Apply button states to each device; lButtons is the device's packed
+            # 32-button mask, so an int compare tells whether anything flipped
             for did in self.device_ids:
-                self._positions[did].lButtons = device_buttons[did]
+                if self._positions[did].lButtons != device_buttons[did]:
+                    self._positions[did].lButtons = device_buttons[did]
+                    dirty.add(did)
                 if device_buttons[did]:
                     LOG.debug("set device %d buttons -> 0x%x", did, device_buttons[did])
 
-            # Send updates to all acquired devices
+            # Send updates only to acquired devices whose position changed
             for did in self.device_ids:
-                if self._acquired.get(did):
-                    if not vjoy_dll.UpdateVJD(did, ctypes.byref(self._positions[did])):
+                if did in dirty and self._acquired.get(did):
+                    if vjoy_dll.UpdateVJD(did, ctypes.byref(self._positions[did])):
+                        self._synced.add(did)
+                    else:
+                        # Resend the full position next time
+                        self._synced.discard(did)
                         LOG.warning("vJoy UpdateVJD failed for device %d", did)
 
         except Exception: